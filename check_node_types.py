@@ -3,78 +3,105 @@
 Quick script to check what node types are in your exported files
 """
 import json
-import glob
+import mmap
+import os
+from collections import Counter, defaultdict
+
+# Optional: incremental JSON parsing keeps memory flat on large exports
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Node types the node creator currently migrates
+ALLOWED_TYPES = frozenset({'Satellite', 'Hub', 'Link', 'Dimension', 'Fact', 'View', 'Base', 'BaseNodes', 'raw'})
+
+def iter_node_details(json_file):
+    """Yield (node_id, node_data) pairs from a subgraph export's node_details"""
+    # mmap can't map an empty file; leave those to json.load's usual decode error
+    if ijson is not None and os.path.getsize(json_file) > 0:
+        # Memory-map the export so pages are read on demand instead of buffered
+        with open(json_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from ijson.kvitems(mm, 'node_details')
+        return
+    
+    with open(json_file, 'r') as f:
+        data = json.load(f)
+    yield from data.get('node_details', {}).items()
 
 def check_node_types():
     print(">>> CHECKING NODE TYPES IN EXPORTED FILES")
     print("-" * 50)
     
     # Find the Apollo files
-    json_files = glob.glob("*subgraph*.json")
+    json_files = [
+        entry.name for entry in os.scandir('.')
+        if entry.is_file() and 'subgraph' in entry.name and entry.name.endswith('.json')
+    ]
     
     if not json_files:
         print("No subgraph JSON files found!")
         return
     
-    all_node_types = {}
-    total_nodes = 0
+    # Count every node per type but keep only the few example names shown in the summary
+    type_counts = Counter()
+    type_examples = defaultdict(list)
     
     for json_file in json_files:
         print(f"\n>> Checking: {json_file}")
         
-        with open(json_file, 'r') as f:
-            data = json.load(f)
-        
-        node_details = data.get('node_details', {})
-        print(f"   Nodes in file: {len(node_details)}")
-        total_nodes += len(node_details)
-        
-        for node_id, node_data in node_details.items():
+        file_nodes = 0
+        for node_id, node_data in iter_node_details(json_file):
+            file_nodes += 1
             node_type = node_data.get('nodeType', 'Unknown')
-            node_name = node_data.get('name', f'Node_{node_id}')
+            type_counts[node_type] += 1
             
-            if node_type not in all_node_types:
-                all_node_types[node_type] = []
-            all_node_types[node_type].append(node_name)
+            examples = type_examples[node_type]
+            if len(examples) < 3:
+                examples.append(node_data.get('name', f'Node_{node_id}'))
+        
+        print(f"   Nodes in file: {file_nodes}")
+    
+    total_nodes = sum(type_counts.values())
     
-    print(f"\n>>> NODE TYPE SUMMARY (Total: {total_nodes} nodes)")
-    print("=" * 60)
+    # Build the summary as one block of lines and write it out in a single call
+    out = []
+    out.append(f"\n>>> NODE TYPE SUMMARY (Total: {total_nodes} nodes)")
+    out.append("=" * 60)
     
-    for node_type, nodes in sorted(all_node_types.items()):
-        print(f"{node_type:15s}: {len(nodes):4d} nodes")
+    for node_type, count in sorted(type_counts.items()):
+        out.append(f"{node_type:15s}: {count:4d} nodes")
         # Show a few examples
-        examples = nodes[:3]
-        for example in examples:
-            print(f"                 - {example}")
-        if len(nodes) > 3:
-            print(f"                 ... and {len(nodes)-3} more")
-        print()
+        for example in type_examples[node_type]:
+            out.append(f"                 - {example}")
+        if count > 3:
+            out.append(f"                 ... and {count-3} more")
+        out.append("")
     
     # Show current filtering
-    print(">>> CURRENT FILTERING IN NODE CREATOR:")
-    allowed_types = ['Satellite', 'Hub', 'Link', 'Dimension', 'Fact', 'View', 'Base', 'BaseNodes', 'raw']
+    out.append(">>> CURRENT FILTERING IN NODE CREATOR:")
+    included_types = type_counts.keys() & ALLOWED_TYPES
+    included_count = sum(type_counts[node_type] for node_type in included_types)
+    excluded_count = total_nodes - included_count
     
-    included_count = 0
-    excluded_count = 0
-    
-    for node_type, nodes in all_node_types.items():
-        if node_type in allowed_types:
-            included_count += len(nodes)
-            print(f"✅ INCLUDED: {node_type} ({len(nodes)} nodes)")
+    for node_type, count in type_counts.items():
+        if node_type in included_types:
+            out.append(f"✅ INCLUDED: {node_type} ({count} nodes)")
         else:
-            excluded_count += len(nodes)
-            print(f"❌ EXCLUDED: {node_type} ({len(nodes)} nodes)")
+            out.append(f"❌ EXCLUDED: {node_type} ({count} nodes)")
     
-    print(f"\n>>> FILTERING RESULTS:")
-    print(f"✅ Would include: {included_count} nodes")
-    print(f"❌ Would exclude: {excluded_count} nodes")
-    print(f"📊 Total: {total_nodes} nodes")
+    out.append(f"\n>>> FILTERING RESULTS:")
+    out.append(f"✅ Would include: {included_count} nodes")
+    out.append(f"❌ Would exclude: {excluded_count} nodes")
+    out.append(f"📊 Total: {total_nodes} nodes")
     
     if excluded_count > 0:
-        print(f"\n>>> TO GET ALL {total_nodes} NODES, ADD THESE TYPES:")
-        for node_type, nodes in all_node_types.items():
-            if node_type not in allowed_types:
-                print(f"   '{node_type}' ({len(nodes)} nodes)")
+        out.append(f"\n>>> TO GET ALL {total_nodes} NODES, ADD THESE TYPES:")
+        for node_type, count in type_counts.items():
+            if node_type not in included_types:
+                out.append(f"   '{node_type}' ({count} nodes)")
+    
+    print("\n".join(out))
 
 if __name__ == "__main__":
     check_node_types()
\ No newline at end of file
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Coalesce Node Detail Cache
+On-disk, read-through cache of node detail payloads shared by the migration
+scripts, so phases that read the same source nodes only GET them once
+"""
+
+import os
+import json
+import time
+import logging
+import tempfile
+from functools import lru_cache
+from coalesce_conn import response_json
+
+logger = logging.getLogger(__name__)
+
+# Cache location and freshness; COALESCE_NODE_CACHE_TTL=0 disables the cache
+NODE_CACHE_DIR = os.getenv('COALESCE_NODE_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'coalesce'))
+NODE_CACHE_TTL = int(os.getenv('COALESCE_NODE_CACHE_TTL', '3600'))  # Seconds a cached node stays fresh
+
+def _cache_path(workspace_id, node_id):
+    return os.path.join(NODE_CACHE_DIR, f"node_{workspace_id}_{node_id}.json")
+
+@lru_cache(maxsize=4096)
+def _parse_cache_file(path, mtime_ns):
+    """Parse a cache file once per version (mtime) within this process"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def load_cached_node(workspace_id, node_id, ttl=NODE_CACHE_TTL):
+    """
+    Return the cached node_info for a node, or None if missing or stale
+
+    Args:
+        workspace_id (str): Workspace the node lives in
+        node_id (str): Node ID
+        ttl (int): Maximum age in seconds; 0 disables the cache
+
+    Returns:
+        dict: Cached node_info, or None
+    """
+    if ttl <= 0:
+        return None
+
+    path = _cache_path(workspace_id, node_id)
+    try:
+        stat = os.stat(path)
+        if time.time() - stat.st_mtime > ttl:
+            return None
+        return _parse_cache_file(path, stat.st_mtime_ns)
+    except (OSError, ValueError):
+        return None
+
+def store_cached_node(workspace_id, node_id, node_info, ttl=NODE_CACHE_TTL):
+    """Write node_info to the cache atomically (readers never see a partial file)"""
+    if ttl <= 0:
+        return
+
+    try:
+        os.makedirs(NODE_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=NODE_CACHE_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(node_info, f)
+            os.replace(tmp_path, _cache_path(workspace_id, node_id))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logger.warning(f"Could not cache node {node_id}: {e}")
+
+def get_node_cached(session, base_url, workspace_id, node_id, ttl=NODE_CACHE_TTL, timeout=30):
+    """
+    Get a node's details, from the cache when fresh, else from the API
+
+    Only use this for nodes the workflow doesn't modify (e.g. source
+    workspace nodes); a node that is updated in between would be served stale.
+
+    Args:
+        session (requests.Session): Session from create_session()
+        base_url (str): Coalesce base URL without trailing slash
+        workspace_id (str): Workspace the node lives in
+        node_id (str): Node ID
+        ttl (int): Maximum cache age in seconds; 0 always fetches
+        timeout (int): Request timeout in seconds
+
+    Returns:
+        tuple: (status_code, node_info); node_info is None unless status is 200
+    """
+    node_info = load_cached_node(workspace_id, node_id, ttl)
+    if node_info is not None:
+        return 200, node_info
+
+    response = session.get(f"{base_url}/api/v1/workspaces/{workspace_id}/nodes/{node_id}", timeout=timeout)
+    if response.status_code != 200:
+        return response.status_code, None
+
+    node_data = response_json(response)
+    node_info = node_data.get('data', node_data)
+    store_cached_node(workspace_id, node_id, node_info, ttl)
+    return 200, node_info
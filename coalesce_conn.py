@@ -5,9 +5,22 @@ Loads API configuration from environment variables
 """
 
 import os
+import time
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
+# Optional: faster JSON decoding for large node payloads
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -15,16 +28,20 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Load environment variables from .env file once per process
+load_dotenv()
+
+@lru_cache(maxsize=1)
 def load_config_from_env():
     """
     Load Coalesce API configuration from environment variables
     
+    The result is cached, so repeated calls across scripts reuse the same
+    configuration dictionary instead of re-reading the environment.
+    
     Returns:
         dict: Configuration dictionary with base_url and access_token
     """
-    # Load environment variables from .env file
-    load_dotenv()
-    
     logger.info("Logging configured: level=INFO")
     
     # Get required environment variables
@@ -83,6 +100,165 @@ def validate_config(config):
     
     return True
 
+def create_session(config=None, pool_maxsize=32, retries=3, backoff_factor=0.3):
+    """
+    Create a requests Session with pooled keep-alive connections and retries
+    
+    Args:
+        config (dict): Optional configuration; when given, its access token
+            is set as the default Authorization header
+        pool_maxsize (int): Maximum pooled connections per host
+        retries (int): Retry attempts for 429/5xx responses and connection errors
+        backoff_factor (float): Exponential backoff base between retries, in
+            seconds; a 429's Retry-After header takes precedence
+        
+    Returns:
+        requests.Session: Session with retry/backoff on 429 and 5xx responses;
+            the final response is returned once retries are exhausted, while
+            connection errors still raise requests.RequestException
+    """
+    session = requests.Session()
+    
+    # GET and PUT are retried (both idempotent), honouring Retry-After; once
+    # retries run out the last 429/5xx response is returned rather than raised,
+    # so callers' status_code checks still see it
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_maxsize, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    
+    session.headers.update({
+        'Accept': 'application/json',
+        'Content-Type': 'application/json'
+    })
+    if config:
+        session.headers['Authorization'] = f'Bearer {config["access_token"]}'
+    
+    return session
+
+def response_json(response):
+    """
+    Decode a response's JSON body, using orjson on the raw bytes when available
+    
+    Args:
+        response (requests.Response): Response to decode
+        
+    Returns:
+        Decoded JSON (usually a dict)
+    """
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+def fetch_nodes_bulk(session, base_url, workspace_id, node_ids, chunk_size=50, max_workers=16):
+    """
+    Fetch details for many nodes of a workspace
+    
+    Asks the workspace node list for up to `chunk_size` ids per request
+    (?ids=a,b,c). The filter counts as supported only while every returned
+    node is one that was asked for; the first response listing any other
+    node is discarded and batching stops. Ids not returned by a filtered
+    listing - or left after batching stopped - are then fetched one GET
+    each, concurrently. A node whose request fails is logged and left out
+    rather than aborting the rest.
+    
+    Args:
+        session (requests.Session): Session from create_session()
+        base_url (str): Coalesce base URL without trailing slash
+        workspace_id (str): Workspace the nodes live in
+        node_ids (list): Node IDs to fetch
+        chunk_size (int): Maximum ids per batched request
+        max_workers (int): Parallel requests for the per-node fallback
+        
+    Returns:
+        dict: {node_id: node_info} for every node that could be fetched
+    """
+    nodes_url = f"{base_url}/api/v1/workspaces/{workspace_id}/nodes"
+    node_ids = list(dict.fromkeys(node_ids))
+    found = {}
+    
+    for start in range(0, len(node_ids), chunk_size):
+        chunk = node_ids[start:start + chunk_size]
+        try:
+            response = session.get(nodes_url, params={'ids': ','.join(chunk), 'detail': 'true'}, timeout=60)
+        except requests.RequestException as e:
+            logger.warning(f"Batched node request failed, fetching nodes one by one: {e}")
+            break
+        if response.status_code != 200:
+            break
+        
+        wanted = set(chunk)
+        listed = response_json(response).get('data', [])
+        if any(node_info.get('id') not in wanted for node_info in listed):
+            # The listing ignored the filter; don't page through the workspace
+            # or trust its entries, fetch this and later chunks per node
+            break
+        for node_info in listed:
+            found[node_info['id']] = node_info
+    
+    def fetch_one(node_id):
+        try:
+            response = session.get(f"{nodes_url}/{node_id}", timeout=30)
+        except requests.RequestException as e:
+            logger.warning(f"Could not get node {node_id}: {e}")
+            return None
+        if response.status_code != 200:
+            logger.warning(f"Could not get node {node_id}: {response.status_code}")
+            return None
+        node_data = response_json(response)
+        return node_data.get('data', node_data)
+    
+    missing = [node_id for node_id in node_ids if node_id not in found]
+    if missing:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for node_id, node_info in zip(missing, executor.map(fetch_one, missing)):
+                if node_info is not None:
+                    found[node_id] = node_info
+    
+    return found
+
+class RateLimiter:
+    """
+    Thread-safe token bucket for capping request rate
+    
+    Lets bursts of up to `burst` requests through immediately and only
+    blocks callers once the average rate would exceed `rate` per second.
+    Use as `with limiter:` around each request, or call acquire().
+    """
+    
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a request token is available, then take it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+    
+    def __enter__(self):
+        self.acquire()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
 if __name__ == "__main__":
     """Test configuration loading when run directly"""
     print("🔍 Testing Coalesce API Configuration")
@@ -92,9 +268,11 @@ if __name__ == "__main__":
     
     if config:
         if validate_config(config):
+            base_url = config['base_url']
+            token = config['access_token']
             print("✅ Configuration loaded successfully!")
-            print(f"🔗 Base URL: {config['base_url']}")
-            print(f"🔑 Token: {config['access_token'][:10]}..." if len(config['access_token']) > 10 else "🔑 Token: [REDACTED]")
+            print(f"🔗 Base URL: {base_url}")
+            print(f"🔑 Token: {token[:10]}..." if len(token) > 10 else "🔑 Token: [REDACTED]")
         else:
             print("❌ Configuration validation failed")
     else:
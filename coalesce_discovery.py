@@ -3,31 +3,112 @@
 Correct Workspace Discovery - Uses includeWorkspaces=true
 """
 
-import requests
 import json
-from coalesce_conn import load_config_from_env
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from coalesce_conn import load_config_from_env, create_session, response_json
+
+# Optional: faster JSON encoding for large project dumps
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Config, URL and headers are resolved once per process (config is cached by coalesce_conn)
+_CFG = load_config_from_env()
+_BASE_URL = _CFG['base_url'].rstrip('/') if _CFG else None
+_PROJECTS_URL = f"{_BASE_URL}/api/v1/projects"
+_PROJECTS_PARAMS = {'includeWorkspaces': 'true'}
+
+# Shared pooled session (keep-alive + retry/backoff on 429/5xx) carrying the auth headers
+_SESSION = create_session(_CFG)
+
+@dataclass
+class WorkspaceInfo:
+    """A workspace discovered on a project"""
+    __slots__ = ('workspace_id', 'workspace_name', 'branch_name', 'project_id', 'project_name', 'source_field')
+    workspace_id: str
+    workspace_name: str
+    branch_name: str
+    project_id: str
+    project_name: str
+    source_field: str
+
+def _normalize_workspace(workspace, project_id, project_name, field):
+    """Build a WorkspaceInfo from either the id/name/branch or workspaceId/... key style"""
+    ws_id = workspace['id'] if 'id' in workspace else workspace.get('workspaceId', 'unknown')
+    ws_name = workspace['name'] if 'name' in workspace else workspace.get('workspaceName', f'Workspace_{ws_id}')
+    branch = workspace['branch'] if 'branch' in workspace else workspace.get('branchName', '')
+    return WorkspaceInfo(ws_id, ws_name, branch, project_id, project_name, field)
+
+def _collect_project_workspaces(project, all_workspaces):
+    """Print a project's workspace fields and append its workspaces to all_workspaces"""
+    project_id = project.get('id', '')
+    project_name = project.get('name', 'Unknown')
+    debug = logger.isEnabledFor(logging.DEBUG)
+    
+    print(f">> PROJECT: {project_name} (ID: {project_id})")
+    if debug:
+        logger.debug("   Available fields: %s", list(project.keys()))
+    
+    # Look for workspace data in various possible fields
+    workspace_fields = ['workspaces', 'developmentWorkspaces', 'environments', 'workspace']
+    
+    found_workspaces = False
+    for field in workspace_fields:
+        if field not in project:
+            continue
+        
+        workspaces_data = project[field]
+        if debug:
+            logger.debug("   Found field '%s': %s", field, type(workspaces_data))
+        
+        # Handle single workspace as dict the same as a one-item list
+        if isinstance(workspaces_data, dict):
+            workspaces_data = [workspaces_data]
+        elif not isinstance(workspaces_data, list):
+            continue
+        
+        for workspace in workspaces_data:
+            if not isinstance(workspace, dict):
+                continue
+            
+            ws = _normalize_workspace(workspace, project_id, project_name, field)
+            all_workspaces.append(ws)
+            found_workspaces = True
+            
+            if debug:
+                branch_info = f" (branch: {ws.branch_name})" if ws.branch_name else ""
+                logger.debug("       %s (ID: %s)%s", ws.workspace_name, ws.workspace_id, branch_info)
+    
+    if not found_workspaces:
+        print(f"   No workspace fields found")
+    
+    print()
+
+def _fetch_projects_page(starting_from=None):
+    """GET one page of projects with their workspaces"""
+    params = _PROJECTS_PARAMS
+    if starting_from:
+        params = {**_PROJECTS_PARAMS, 'startingFrom': starting_from}
+    return _SESSION.get(_PROJECTS_URL, params=params, timeout=30)
 
 def discover_workspaces():
-    config = load_config_from_env()
-    base_url = config['base_url'].rstrip('/')
-    headers = {
-        'Authorization': f'Bearer {config["access_token"]}',
-        'Accept': 'application/json',
-        'Content-Type': 'application/json'
-    }
+    if not _CFG:
+        print("Error: Coalesce API configuration not found (check your .env file)")
+        return
     
     print("=== WORKSPACE DISCOVERY - CORRECT ENDPOINT ===")
-    print(f"Base URL: {base_url}")
+    print(f"Base URL: {_BASE_URL}")
     print()
     
     # Use the correct endpoint with includeWorkspaces=true
     print(">> GETTING PROJECTS WITH WORKSPACES...")
     try:
-        response = requests.get(
-            f"{base_url}/api/v1/projects?includeWorkspaces=true", 
-            headers=headers, 
-            timeout=30
-        )
+        response = _fetch_projects_page()
         
         print(f"GET /api/v1/projects?includeWorkspaces=true: {response.status_code}")
         
@@ -35,85 +116,48 @@ def discover_workspaces():
             print(f"Failed: {response.text}")
             return
             
-        data = response.json()
-        projects = data.get('data', [])
+        data = response_json(response)
         
-        print(f"Found {len(projects)} projects with workspace data")
-        print()
+        all_projects = []
+        all_workspaces = []
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            page = data
+            while True:
+                projects = page.get('data', [])
+                next_cursor = page.get('next')
+                
+                # Prefetch the next page while this one is processed
+                next_page = executor.submit(_fetch_projects_page, next_cursor) if next_cursor else None
+                
+                print(f"Found {len(projects)} projects with workspace data")
+                print()
+                all_projects.extend(projects)
+                
+                # Process each project
+                for project in projects:
+                    _collect_project_workspaces(project, all_workspaces)
+                
+                if next_page is None:
+                    break
+                
+                response = next_page.result()
+                if response.status_code != 200:
+                    print(f"Failed to fetch next projects page: {response.status_code} {response.text}")
+                    break
+                page = response_json(response)
         
         # Save full response for debugging
-        with open('projects_with_workspaces.json', 'w') as f:
-            json.dump(data, f, indent=2)
+        data['data'] = all_projects
+        if orjson is not None:
+            with open('projects_with_workspaces.json', 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open('projects_with_workspaces.json', 'w') as f:
+                json.dump(data, f, indent=2)
         print("Full response saved to: projects_with_workspaces.json")
         print()
         
-        all_workspaces = []
-        
-        # Process each project
-        for project in projects:
-            project_id = project.get('id', '')
-            project_name = project.get('name', 'Unknown')
-            
-            print(f">> PROJECT: {project_name} (ID: {project_id})")
-            print(f"   Available fields: {list(project.keys())}")
-            
-            # Look for workspace data in various possible fields
-            workspace_fields = ['workspaces', 'developmentWorkspaces', 'environments', 'workspace']
-            
-            found_workspaces = False
-            for field in workspace_fields:
-                if field in project:
-                    workspaces_data = project[field]
-                    print(f"   Found field '{field}': {type(workspaces_data)}")
-                    
-                    if isinstance(workspaces_data, list):
-                        print(f"     Contains {len(workspaces_data)} items")
-                        for i, workspace in enumerate(workspaces_data):
-                            if isinstance(workspace, dict):
-                                ws_id = workspace.get('id', workspace.get('workspaceId', 'unknown'))
-                                ws_name = workspace.get('name', workspace.get('workspaceName', f'Workspace_{ws_id}'))
-                                branch = workspace.get('branch', workspace.get('branchName', ''))
-                                
-                                workspace_info = {
-                                    'workspace_id': ws_id,
-                                    'workspace_name': ws_name,
-                                    'branch_name': branch,
-                                    'project_id': project_id,
-                                    'project_name': project_name,
-                                    'source_field': field
-                                }
-                                all_workspaces.append(workspace_info)
-                                
-                                branch_info = f" (branch: {branch})" if branch else ""
-                                print(f"       {i+1}. {ws_name} (ID: {ws_id}){branch_info}")
-                                found_workspaces = True
-                    
-                    elif isinstance(workspaces_data, dict):
-                        print(f"     Dict keys: {list(workspaces_data.keys())}")
-                        # Handle single workspace as dict
-                        ws_id = workspaces_data.get('id', workspaces_data.get('workspaceId', 'unknown'))
-                        ws_name = workspaces_data.get('name', workspaces_data.get('workspaceName', f'Workspace_{ws_id}'))
-                        branch = workspaces_data.get('branch', workspaces_data.get('branchName', ''))
-                        
-                        workspace_info = {
-                            'workspace_id': ws_id,
-                            'workspace_name': ws_name, 
-                            'branch_name': branch,
-                            'project_id': project_id,
-                            'project_name': project_name,
-                            'source_field': field
-                        }
-                        all_workspaces.append(workspace_info)
-                        
-                        branch_info = f" (branch: {branch})" if branch else ""
-                        print(f"       {ws_name} (ID: {ws_id}){branch_info}")
-                        found_workspaces = True
-            
-            if not found_workspaces:
-                print(f"   No workspace fields found")
-            
-            print()
-        
         # Summary
         print(">> SUMMARY - ALL DISCOVERED WORKSPACES:")
         if all_workspaces:
@@ -121,13 +165,13 @@ def discover_workspaces():
             print()
             
             for ws in all_workspaces:
-                branch_info = f" (branch: {ws['branch_name']})" if ws['branch_name'] else ""
-                print(f"  - {ws['workspace_name']} (ID: {ws['workspace_id']}) [Project: {ws['project_name']}]{branch_info}")
+                branch_info = f" (branch: {ws.branch_name})" if ws.branch_name else ""
+                print(f"  - {ws.workspace_name} (ID: {ws.workspace_id}) [Project: {ws.project_name}]{branch_info}")
             
             print(f"\n>> MIGRATION CONFIG SUGGESTIONS:")
             print(f"Use these workspace IDs in your migration config:")
             for ws in all_workspaces:
-                print(f"  'workspace_id': '{ws['workspace_id']}', 'workspace_name': '{ws['workspace_name']}', 'project': '{ws['project_name']}'")
+                print(f"  'workspace_id': '{ws.workspace_id}', 'workspace_name': '{ws.workspace_name}', 'project': '{ws.project_name}'")
         else:
             print("No workspaces found. Check the saved JSON file for the actual structure.")
             
@@ -16,14 +16,36 @@ Usage:
     python enhanced_unified_metadata_hack.py --patterns "STG_,S_,H_,L_" --execute
 """
 
-import requests
 import json
-import glob
 import time
 import os
+import re
 import argparse
+import logging
+import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from types import MappingProxyType
+from contextlib import contextmanager
+from functools import lru_cache
 from dotenv import load_dotenv
+from coalesce_conn import create_session, RateLimiter, response_json
+
+# Progress output; per-node detail is logged at DEBUG so it costs nothing unless --verbose
+logger = logging.getLogger('metadata_hack')
+
+# Optional: incremental JSON parsing for large subgraph exports
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Optional: faster JSON encoding/decoding (stdlib json is used when missing)
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # =============================================================================
 # ENHANCED CONFIGURATION - HANDLES ALL DATA VAULT NODE TYPES
@@ -31,6 +53,10 @@ from dotenv import load_dotenv
 TARGET_WORKSPACE_ID = "270"  # Your PROD workspace ID
 PROJECT_NAME = "Enhanced Unified Hack"
 API_TIMEOUT = 90
+MAX_CONCURRENT_REQUESTS = 16  # Parallel node-detail GETs during enrichment
+NODE_CACHE_TTL = 300  # Seconds a fetched node's details are reused before re-fetching
+STREAM_THRESHOLD_BYTES = 1 << 20  # Stream subgraph exports at least this large (needs ijson)
+MAX_REQUESTS_PER_SECOND = 10  # Token-bucket cap on API calls (0 disables)
 
 # 🎯 COMPREHENSIVE DATA VAULT PATTERNS
 DEFAULT_PATTERNS = [
@@ -63,49 +89,161 @@ EXCLUDE_PATTERNS = [
     "_BACKUP_"      # Backup nodes
 ]
 
-# 🔧 ENHANCED: Comprehensive node filtering function
-def enhanced_node_filter(node_name, patterns):
+# Uppercased pattern tuples, built once so the filter does no per-call .upper() work
+_EXCLUDE_U = tuple(p.upper() for p in EXCLUDE_PATTERNS)
+_SUFFIX_U = tuple(s.upper() for s in SUFFIX_PATTERNS)
+# Data Vault prefix groups; str.startswith takes the tuple in one C call
+_SAT_PREFIXES = ("S_", "SAT_")
+_HUB_PREFIXES = ("H_", "HUB_")
+_LNK_PREFIXES = ("L_", "LNK_")
+_SUFFIX_DV_GUARD_U = _SAT_PREFIXES + _HUB_PREFIXES + _LNK_PREFIXES + ("STG_", "STAGE")
+_DV_INDICATORS_U = ("HUB_", "SAT_", "LNK_", "STG_", "STAGE_", "FACT_", "DIM_")
+
+def _literal_alternation(literals):
+    """Regex alternation of fixed literals so containment is a single C-level scan"""
+    return "(?:" + "|".join(re.escape(literal) for literal in literals) + ")"
+
+_EXCLUDE_RE = re.compile(_literal_alternation(_EXCLUDE_U))
+
+# Every include rule that runs after the prefix check, folded into one scan:
+#   1. ends with a special suffix AND contains a DV guard literal somewhere
+#   2. S_/SAT_ satellites containing _CURRENT anywhere (it may overlap the prefix)
+#   3. a DV indicator anywhere in the name (each indicator contains "_")
+_FALLBACK_INCLUDE_RE = re.compile(
+    r"\A(?:"
+    + r"(?=.*" + _literal_alternation(_SUFFIX_DV_GUARD_U) + r").*" + _literal_alternation(_SUFFIX_U) + r"\Z"
+    + r"|(?=.*_CURRENT)" + _literal_alternation(_SAT_PREFIXES)
+    + r")|" + _literal_alternation(_DV_INDICATORS_U),
+    re.DOTALL
+)
+
+@lru_cache(maxsize=8)
+def build_node_filter(patterns):
     """
-    ENHANCED function to determine if a node should be processed.
-    Handles all Data Vault naming conventions including special cases.
-    Return True to include the node, False to exclude it.
+    Build a node filter specialised for one patterns tuple.
+    The prefix tuple and compiled regexes are resolved once and bound to the
+    returned function, so per-node calls do no pattern setup at all. Results
+    are memoized per node name, since the same names are filtered again after
+    loading, enrichment and the final accessibility pass.
     """
-    # Quick exclusion check first
-    for exclude in EXCLUDE_PATTERNS:
-        if exclude in node_name.upper():
-            return False
-    
     # Special pattern: "all-dv" means all Data Vault patterns
-    if patterns == ["all-dv"]:
+    if patterns == ("all-dv",):
         patterns = DEFAULT_PATTERNS
+    prefixes = tuple(p.upper() for p in patterns)
+    is_excluded = _EXCLUDE_RE.search
+    fallback_include = _FALLBACK_INCLUDE_RE.search
     
-    # Check prefix patterns
-    for pattern in patterns:
-        if node_name.upper().startswith(pattern.upper()):
-            return True
-    
-    # Check suffix patterns for satellites and other special cases
-    for suffix in SUFFIX_PATTERNS:
-        if node_name.upper().endswith(suffix.upper()):
-            # Additional check: make sure it's likely a Data Vault node
-            if any(dv_pattern in node_name.upper() for dv_pattern in ["S_", "SAT_", "H_", "HUB_", "L_", "LNK_", "STG_", "STAGE"]):
-                return True
-    
-    # Special case: Satellites that follow S_*_CURRENT pattern
-    if "_CURRENT" in node_name.upper():
-        # Check if it starts with S_ or SAT_
-        if node_name.upper().startswith("S_") or node_name.upper().startswith("SAT_"):
+    @lru_cache(maxsize=None)
+    def node_filter(node_name):
+        name_u = node_name.upper()
+        
+        # Quick exclusion check first
+        if is_excluded(name_u):
+            return False
+        
+        # Check prefix patterns
+        if name_u.startswith(prefixes):
             return True
+        
+        # Suffix patterns, S_*_CURRENT satellites and DV-style names that might
+        # be missed, all decided by a single pass over the name
+        return fallback_include(name_u) is not None
     
-    # Special case: Any node with DV-style underscores that might be missed
-    if "_" in node_name:
-        # Check for common DV patterns anywhere in the name
-        dv_indicators = ["HUB_", "SAT_", "LNK_", "STG_", "STAGE_", "FACT_", "DIM_"]
-        for indicator in dv_indicators:
-            if indicator in node_name.upper():
-                return True
+    return node_filter
+
+def _load_json_file(file):
+    """Parse a JSON file, using orjson on the raw bytes when available"""
+    if orjson is not None:
+        with open(file, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(file, 'r') as f:
+        return json.load(f)
+
+def _to_json(data, indent=False):
+    """Serialize data to a JSON string (2-space indented if requested), using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    return json.dumps(data, indent=2 if indent else None)
+
+@contextmanager
+def _open_subgraph_export(file):
+    """
+    Open a subgraph export and yield (subgraph_name, node_details items).
+    Exports of STREAM_THRESHOLD_BYTES or more are streamed with ijson when it
+    is installed, so only one node's data is materialized at a time.
+    """
+    if ijson is not None and os.path.getsize(file) >= STREAM_THRESHOLD_BYTES:
+        with open(file, 'rb') as f:
+            subgraph_name = next(ijson.items(f, 'subgraph_name'), 'Unknown')
+            f.seek(0)
+            yield subgraph_name, ijson.kvitems(f, 'node_details', use_float=True)
+        return
     
-    return False
+    data = _load_json_file(file)
+    yield data.get('subgraph_name', 'Unknown'), data.get('node_details', {}).items()
+
+class TargetNode:
+    """A node selected for the hack, from either an API migration result or a subgraph export"""
+    __slots__ = ('id', 'name', 'name_u', 'is_current', 'is_satellite', 'source', 'source_file', 'original_id',
+                 'original_data', 'subgraph', 'needs_api_fetch', 'api_accessible', 'api_error')
+
+    def __init__(self, id, name, source, source_file, original_id=None, original_data=None,
+                 subgraph=None, needs_api_fetch=False):
+        self.id = id
+        self.set_name(name)
+        self.source = source
+        self.source_file = source_file
+        self.original_id = original_id
+        self.original_data = original_data
+        self.subgraph = subgraph
+        self.needs_api_fetch = needs_api_fetch
+        self.api_accessible = True
+        self.api_error = None
+
+    def set_name(self, name):
+        """Set the name along with its uppercased form and _CURRENT / S_*_CURRENT flags"""
+        self.name = name
+        self.name_u = name_u = name.upper()
+        # The _CURRENT scan is done once here and reused by every later check
+        self.is_current = is_current = "_CURRENT" in name_u
+        self.is_satellite = is_current and name_u.startswith("S_")
+
+# Data Vault component categories as (prefixes, substring, category); first match wins
+_DV_CATEGORIES = (
+    (_SAT_PREFIXES, None, "Satellites"),
+    (_HUB_PREFIXES, None, "Hubs"),
+    (_LNK_PREFIXES, None, "Links"),
+    (("STG_",), "STAGE", "Stages"),
+    (("FACT_",), None, "Facts"),
+    (("DIM_",), None, "Dimensions")
+)
+
+def _dv_category(name_u):
+    """Data Vault component category for an uppercased node name"""
+    return next(
+        (category for prefixes, contains, category in _DV_CATEGORIES
+         if name_u.startswith(prefixes) or (contains and contains in name_u)),
+        "Other"
+    )
+
+# Migration result file names (*created_nodes*, *nodes_created*, *creation_result*)
+_MIGRATION_FILE_RE = re.compile("created_nodes|nodes_created|creation_result")
+
+# Suffix buckets reported by analyze_node_patterns as (label, compiled search);
+# _CURRENT is counted from the per-node is_current flag instead
+_SUFFIX_SEARCHES = (
+    ("_HISTORY", re.compile("_HISTORY").search),
+    ("_STAGE/_STG", re.compile("_STAGE|_STG").search)
+)
+
+# 🔧 ENHANCED: Comprehensive node filtering function
+def enhanced_node_filter(node_name, patterns):
+    """
+    ENHANCED function to determine if a node should be processed.
+    Handles all Data Vault naming conventions including special cases.
+    Return True to include the node, False to exclude it.
+    """
+    return build_node_filter(tuple(patterns))(node_name)
 
 # =============================================================================
 
@@ -119,7 +257,7 @@ print(f"   Enhanced: Better pattern matching for S_, H_, L_, STG_, satellites, e
 class EnhancedUnifiedMetadataHack:
     """Enhanced unified metadata refresh hack for ALL Data Vault node types"""
 
-    def __init__(self, patterns=None):
+    def __init__(self, patterns=None, single_put=False, max_rps=MAX_REQUESTS_PER_SECOND):
         # Load API credentials from .env file
         load_dotenv()
         
@@ -134,14 +272,32 @@ class EnhancedUnifiedMetadataHack:
         
         self.base_url = self.base_url.rstrip('/')
         
-        self.headers = {
+        # Read-only so the headers can be shared safely across worker threads
+        self.headers = MappingProxyType({
             'Authorization': f'Bearer {self.access_token}',
             'Accept': 'application/json',
             'Content-Type': 'application/json'
-        }
+        })
+
+        # Shared keep-alive session: pooled connections reused across worker threads,
+        # with retry/backoff on 429 and 5xx responses
+        self.session = create_session(pool_maxsize=32)
+        self.session.headers.update(self.headers)
 
         self.target_workspace = TARGET_WORKSPACE_ID
+        # Node endpoint URLs are this prefix + node_id
+        self._nodes_url_prefix = f"{self.base_url}/api/v1/workspaces/{self.target_workspace}/nodes/"
         self.patterns = patterns or DEFAULT_PATTERNS
+        self.node_filter = build_node_filter(tuple(self.patterns))
+        # Single-PUT mode leaves the trailing space in place instead of reverting it
+        self.single_put = single_put
+
+        # Shared token bucket for every GET/PUT; bursts pass, sustained load is capped
+        # (429 Retry-After is honoured by the session's retry policy)
+        self.limiter = RateLimiter(max_rps) if max_rps else None
+
+        # node_id -> (fetched_at, node_info) read-through cache for node GETs
+        self._node_cache = {}
 
         # Results tracking
         self.all_target_nodes = []
@@ -162,47 +318,30 @@ class EnhancedUnifiedMetadataHack:
         print(f"\n>>> ANALYZING DISCOVERED NODE PATTERNS")
         print("-" * 60)
         
-        pattern_analysis = {}
-        prefix_analysis = {}
-        suffix_analysis = {}
+        names = [node.name_u for node in all_nodes]
         
-        for node in all_nodes:
-            node_name = node['name'].upper()
-            
-            # Analyze prefixes (first 4 characters)
-            prefix = node_name[:4] if len(node_name) >= 4 else node_name
-            prefix_analysis[prefix] = prefix_analysis.get(prefix, 0) + 1
-            
-            # Analyze suffixes
-            if "_CURRENT" in node_name:
-                suffix_analysis["_CURRENT"] = suffix_analysis.get("_CURRENT", 0) + 1
-            if "_HISTORY" in node_name:
-                suffix_analysis["_HISTORY"] = suffix_analysis.get("_HISTORY", 0) + 1
-            if "_STAGE" in node_name or "_STG" in node_name:
-                suffix_analysis["_STAGE/_STG"] = suffix_analysis.get("_STAGE/_STG", 0) + 1
-            
-            # Categorize by Data Vault component
-            if node_name.startswith("S_") or node_name.startswith("SAT_"):
-                pattern_analysis["Satellites"] = pattern_analysis.get("Satellites", 0) + 1
-            elif node_name.startswith("H_") or node_name.startswith("HUB_"):
-                pattern_analysis["Hubs"] = pattern_analysis.get("Hubs", 0) + 1
-            elif node_name.startswith("L_") or node_name.startswith("LNK_"):
-                pattern_analysis["Links"] = pattern_analysis.get("Links", 0) + 1
-            elif node_name.startswith("STG_") or "STAGE" in node_name:
-                pattern_analysis["Stages"] = pattern_analysis.get("Stages", 0) + 1
-            elif node_name.startswith("FACT_"):
-                pattern_analysis["Facts"] = pattern_analysis.get("Facts", 0) + 1
-            elif node_name.startswith("DIM_"):
-                pattern_analysis["Dimensions"] = pattern_analysis.get("Dimensions", 0) + 1
-            else:
-                pattern_analysis["Other"] = pattern_analysis.get("Other", 0) + 1
+        # Categorize by Data Vault component
+        pattern_analysis = Counter(map(_dv_category, names))
+        
+        # Analyze prefixes (first 4 characters)
+        prefix_analysis = Counter(name[:4] for name in names)
+        
+        # Analyze suffixes: one C-level regex scan over all names per remaining bucket
+        suffix_analysis = Counter()
+        current_count = sum(node.is_current for node in all_nodes)
+        if current_count:
+            suffix_analysis["_CURRENT"] = current_count
+        for suffix, search in _SUFFIX_SEARCHES:
+            count = sum(1 for _ in filter(search, names))
+            if count:
+                suffix_analysis[suffix] = count
         
         print(f"📊 DATA VAULT COMPONENT BREAKDOWN:")
         for component, count in sorted(pattern_analysis.items()):
             print(f"   {component}: {count} nodes")
         
         print(f"\n📊 PREFIX ANALYSIS (Top 10):")
-        for prefix, count in sorted(prefix_analysis.items(), key=lambda x: x[1], reverse=True)[:10]:
+        for prefix, count in prefix_analysis.most_common(10):
             print(f"   {prefix}: {count} nodes")
         
         print(f"\n📊 SUFFIX ANALYSIS:")
@@ -210,11 +349,11 @@ class EnhancedUnifiedMetadataHack:
             print(f"   {suffix}: {count} nodes")
         
         # Special focus on S_ nodes with _CURRENT
-        s_current_nodes = [n for n in all_nodes if n['name'].upper().startswith("S_") and "_CURRENT" in n['name'].upper()]
+        s_current_nodes = [n for n in all_nodes if n.is_satellite]
         if s_current_nodes:
             print(f"\n🎯 S_*_CURRENT SATELLITES FOUND: {len(s_current_nodes)} nodes")
             for node in s_current_nodes[:5]:  # Show first 5
-                print(f"   - {node['name']} ({node['source']})")
+                print(f"   - {node.name} ({node.source})")
             if len(s_current_nodes) > 5:
                 print(f"   ... and {len(s_current_nodes) - 5} more")
 
@@ -223,25 +362,20 @@ class EnhancedUnifiedMetadataHack:
         print(f"\n>>> FINDING ALL SOURCE FILES")
         print("-" * 60)
         
-        # Migration result files (API-migrated nodes)
-        migration_patterns = [
-            "*created_nodes*.json",
-            "*nodes_created*.json", 
-            "*creation_result*.json"
-        ]
-        
+        # One directory pass classifies both kinds of file:
+        # migration result files (API-migrated nodes) and subgraph export
+        # files (UI-migrated nodes), excluding subgraph migration results
         migration_files = []
-        for pattern in migration_patterns:
-            files = glob.glob(pattern)
-            migration_files.extend(files)
-        
-        # Remove duplicates
-        migration_files = list(set(migration_files))
-        
-        # Subgraph export files (UI-migrated nodes)
-        subgraph_files = glob.glob("subgraph_*.json")
-        # Filter out migration results
-        subgraph_files = [f for f in subgraph_files if not f.startswith('subgraph_migration_')]
+        subgraph_files = []
+        with os.scandir('.') as entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith('.') or not name.endswith('.json') or not entry.is_file():
+                    continue
+                if _MIGRATION_FILE_RE.search(name):
+                    migration_files.append(name)
+                if name.startswith('subgraph_') and not name.startswith('subgraph_migration_'):
+                    subgraph_files.append(name)
         
         print(f"📁 MIGRATION RESULT FILES: {len(migration_files)}")
         for file in migration_files:
@@ -253,6 +387,61 @@ class EnhancedUnifiedMetadataHack:
         
         return migration_files, subgraph_files
 
+    def _load_files_parallel(self, load_one, files):
+        """Run a per-file loader over files on a small thread pool, preserving file order"""
+        if not files:
+            return []
+        with ThreadPoolExecutor(max_workers=min(8, len(files))) as executor:
+            return list(executor.map(load_one, files))
+
+    def _load_api_migration_file(self, file):
+        """Load matching nodes from one API migration result file; returns (nodes, log_lines)"""
+        nodes = []
+        lines = []
+        verbose = logger.isEnabledFor(logging.DEBUG)
+        
+        try:
+            data = _load_json_file(file)
+            
+            lines.append(f"📄 Processing: {file}")
+            
+            # Extract created nodes from API migration results
+            creation_result = data.get('creation_result', {})
+            created_nodes = creation_result.get('created_nodes', [])
+            node_id_mapping = creation_result.get('node_id_mapping', {})
+            
+            if created_nodes:
+                lines.append(f"   Found {len(created_nodes)} API-created nodes")
+                matching_count = 0
+                for node in created_nodes:
+                    node_name = node.get('name', '')
+                    if self.node_filter(node_name):
+                        nodes.append(TargetNode(
+                            node.get('new_id'), node_name, 'api_migration', file,
+                            original_id=node.get('original_id'),
+                            needs_api_fetch=True  # Need to get current data
+                        ))
+                        matching_count += 1
+                        if verbose:
+                            lines.append(f"      ✅ {node_name} (API-migrated)")
+                lines.append(f"   Matching nodes: {matching_count}")
+            
+            elif node_id_mapping:
+                lines.append(f"   Found {len(node_id_mapping)} node mappings (need to fetch details)")
+                # Need to fetch details for each node
+                for original_id, new_id in node_id_mapping.items():
+                    nodes.append(TargetNode(
+                        new_id, f'Node_{new_id[:8]}',  # Temporary name
+                        'api_migration', file,
+                        original_id=original_id,
+                        needs_api_fetch=True
+                    ))
+            
+        except Exception as e:
+            lines.append(f"   [ERROR] Error loading {file}: {e}")
+        
+        return nodes, lines
+
     def load_api_migrated_nodes(self, migration_files):
         """Load nodes from API migration result files with enhanced filtering"""
         print(f"\n>>> LOADING API-MIGRATED NODES (ENHANCED FILTERING)")
@@ -260,170 +449,156 @@ class EnhancedUnifiedMetadataHack:
         
         api_nodes = []
         
-        for file in migration_files:
-            try:
-                with open(file, 'r') as f:
-                    data = json.load(f)
-                
-                print(f"📄 Processing: {file}")
-                
-                # Extract created nodes from API migration results
-                creation_result = data.get('creation_result', {})
-                created_nodes = creation_result.get('created_nodes', [])
-                node_id_mapping = creation_result.get('node_id_mapping', {})
-                
-                if created_nodes:
-                    print(f"   Found {len(created_nodes)} API-created nodes")
-                    matching_count = 0
-                    for node in created_nodes:
-                        node_name = node.get('name', '')
-                        if enhanced_node_filter(node_name, self.patterns):
-                            api_nodes.append({
-                                'id': node.get('new_id'),
-                                'name': node_name,
-                                'original_id': node.get('original_id'),
-                                'source': 'api_migration',
-                                'source_file': file,
-                                'needs_api_fetch': True  # Need to get current data
-                            })
-                            matching_count += 1
-                            print(f"      ✅ {node_name} (API-migrated)")
-                    print(f"   Matching nodes: {matching_count}")
-                
-                elif node_id_mapping:
-                    print(f"   Found {len(node_id_mapping)} node mappings (need to fetch details)")
-                    # Need to fetch details for each node
-                    for original_id, new_id in node_id_mapping.items():
-                        api_nodes.append({
-                            'id': new_id,
-                            'name': f'Node_{new_id[:8]}',  # Temporary name
-                            'original_id': original_id,
-                            'source': 'api_migration',
-                            'source_file': file,
-                            'needs_api_fetch': True
-                        })
-                
-            except Exception as e:
-                print(f"   [ERROR] Error loading {file}: {e}")
+        # Files are parsed in parallel; each file's log is printed as one block
+        for nodes, lines in self._load_files_parallel(self._load_api_migration_file, migration_files):
+            if lines:
+                print("\n".join(lines))
+            api_nodes.extend(nodes)
         
         print(f"📊 Total API nodes found: {len(api_nodes)}")
         return api_nodes
 
-    def load_ui_migrated_nodes(self, subgraph_files):
-        """Load nodes from subgraph export files with enhanced filtering"""
-        print(f"\n>>> LOADING UI-MIGRATED NODES (ENHANCED FILTERING)")
-        print("-" * 50)
+    def _load_subgraph_file(self, file):
+        """Load matching nodes from one subgraph export file; returns (nodes, log_lines)"""
+        nodes = []
+        lines = []
+        verbose = logger.isEnabledFor(logging.DEBUG)
         
-        ui_nodes = []
-        
-        for file in subgraph_files:
-            try:
-                with open(file, 'r') as f:
-                    data = json.load(f)
-                
-                subgraph_name = data.get('subgraph_name', 'Unknown')
-                node_details = data.get('node_details', {})
-                
-                print(f"📄 Processing: {file} ('{subgraph_name}')")
-                print(f"   Found {len(node_details)} total nodes")
+        try:
+            with _open_subgraph_export(file) as (subgraph_name, node_details):
+                lines.append(f"📄 Processing: {file} ('{subgraph_name}')")
                 
+                total_count = 0
                 matching_count = 0
-                for node_id, node_data in node_details.items():
+                for node_id, node_data in node_details:
+                    total_count += 1
                     if not isinstance(node_data, dict):
                         continue
                     
                     node_name = node_data.get('name', '')
-                    if enhanced_node_filter(node_name, self.patterns):
-                        ui_nodes.append({
-                            'id': node_id,
-                            'name': node_name,
-                            'original_data': node_data,
-                            'source': 'ui_migration',
-                            'source_file': file,
-                            'subgraph': subgraph_name,
-                            'needs_api_fetch': False  # Already have full data
-                        })
+                    if self.node_filter(node_name):
+                        nodes.append(TargetNode(
+                            node_id, node_name, 'ui_migration', file,
+                            original_data=node_data,
+                            subgraph=subgraph_name,
+                            needs_api_fetch=False  # Already have full data
+                        ))
                         matching_count += 1
-                        print(f"      ✅ {node_name} (UI-migrated)")
-                
-                print(f"   Matching nodes: {matching_count}")
-                
-            except Exception as e:
-                print(f"   [ERROR] Error loading {file}: {e}")
+                        if verbose:
+                            lines.append(f"      ✅ {node_name} (UI-migrated)")
+            
+            lines.append(f"   Found {total_count} total nodes")
+            lines.append(f"   Matching nodes: {matching_count}")
+            
+        except Exception as e:
+            lines.append(f"   [ERROR] Error loading {file}: {e}")
+        
+        return nodes, lines
+
+    def load_ui_migrated_nodes(self, subgraph_files):
+        """Load nodes from subgraph export files with enhanced filtering"""
+        print(f"\n>>> LOADING UI-MIGRATED NODES (ENHANCED FILTERING)")
+        print("-" * 50)
+        
+        ui_nodes = []
+        
+        # Files are parsed in parallel; each file's log is printed as one block
+        for nodes, lines in self._load_files_parallel(self._load_subgraph_file, subgraph_files):
+            if lines:
+                print("\n".join(lines))
+            ui_nodes.extend(nodes)
         
         print(f"📊 Total UI nodes found: {len(ui_nodes)}")
         return ui_nodes
 
-    def enrich_api_nodes(self, api_nodes):
+    def _fetch_node_details(self, node_id):
+        """GET current details for one node; returns (status_code, node_info or None)"""
+        if self.limiter:
+            self.limiter.acquire()
+        response = self.session.get(
+            self._nodes_url_prefix + node_id,
+            timeout=30
+        )
+        
+        if response.status_code != 200:
+            return response.status_code, None
+        
+        current_data = response_json(response)
+        return response.status_code, current_data.get('data', current_data)
+
+    def _get_node(self, node_id, ttl=NODE_CACHE_TTL):
+        """Node details via the TTL cache; returns (status_code, node_info or None)"""
+        cached = self._node_cache.get(node_id)
+        if cached and time.monotonic() - cached[0] < ttl:
+            return 200, cached[1]
+        
+        status_code, node_info = self._fetch_node_details(node_id)
+        if node_info is not None:
+            self._node_cache[node_id] = (time.monotonic(), node_info)
+        return status_code, node_info
+
+    def enrich_api_nodes(self, api_nodes, max_workers=MAX_CONCURRENT_REQUESTS):
         """Get current details for API-migrated nodes that need fetching"""
         print(f"\n>>> ENRICHING API NODE DATA (ENHANCED FILTERING)")
         print("-" * 50)
         
-        nodes_needing_fetch = [n for n in api_nodes if n.get('needs_api_fetch', False)]
-        print(f"Fetching details for {len(nodes_needing_fetch)} API nodes...")
+        nodes_needing_fetch = [n for n in api_nodes if n.needs_api_fetch]
+        print(f"Fetching details for {len(nodes_needing_fetch)} API nodes ({max_workers} concurrent requests)...")
         
         enriched_nodes = []
         
-        for i, node in enumerate(api_nodes, 1):
-            if not node.get('needs_api_fetch', False):
-                enriched_nodes.append(node)
-                continue
-            
-            node_id = node['id']
-            print(f"   {i:3d}/{len(api_nodes)}: Fetching {node_id[:8]}...")
+        # Issue all GETs concurrently; results are consumed in the original node order
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self._get_node, node.id) if node.needs_api_fetch else None
+                for node in api_nodes
+            ]
             
-            try:
-                response = requests.get(
-                    f"{self.base_url}/api/v1/workspaces/{self.target_workspace}/nodes/{node_id}",
-                    headers=self.headers,
-                    timeout=30
-                )
+            for i, (node, future) in enumerate(zip(api_nodes, futures), 1):
+                if future is None:
+                    enriched_nodes.append(node)
+                    continue
                 
-                if response.status_code == 200:
-                    current_data = response.json()
-                    node_info = current_data.get('data', current_data)
-                    
-                    node_name = node_info.get('name', f'Node_{node_id}')
+                node_id = node.id
+                logger.debug("   %3d/%d: Fetched %s...", i, len(api_nodes), node_id[:8])
+                
+                try:
+                    status_code, node_info = future.result()
                     
-                    # Check if this node matches our enhanced patterns after getting real name
-                    if enhanced_node_filter(node_name, self.patterns):
-                        enriched_node = node.copy()
-                        enriched_node.update({
-                            'name': node_name,
-                            'original_data': node_info,
-                            'api_accessible': True
-                        })
-                        enriched_nodes.append(enriched_node)
-                        print(f"      ✅ {node_name} (matches enhanced patterns)")
+                    if node_info is not None:
+                        node_name = node_info.get('name', f'Node_{node_id}')
                         
-                        # Special logging for S_*_CURRENT nodes
-                        if node_name.upper().startswith("S_") and "_CURRENT" in node_name.upper():
-                            print(f"         🎯 SATELLITE CURRENT: {node_name}")
+                        # Check if this node matches our enhanced patterns after getting real name
+                        if self.node_filter(node_name):
+                            # Loaded nodes are only used here, so enrich them in place
+                            node.set_name(node_name)
+                            node.original_data = node_info
+                            node.api_accessible = True
+                            enriched_nodes.append(node)
+                            logger.debug("      ✅ %s (matches enhanced patterns)", node_name)
+                            
+                            # Special logging for S_*_CURRENT nodes
+                            if node.is_satellite:
+                                logger.debug("         🎯 SATELLITE CURRENT: %s", node_name)
+                        else:
+                            logger.debug("      ⏭️ %s (doesn't match enhanced patterns)", node_name)
                     else:
-                        print(f"      ⏭️ {node_name} (doesn't match enhanced patterns)")
-                else:
-                    print(f"      ❌ API error {response.status_code}")
-                    # Keep node but mark as inaccessible
-                    enriched_node = node.copy()
-                    enriched_node.update({
-                        'api_accessible': False,
-                        'api_error': response.status_code
-                    })
-                    enriched_nodes.append(enriched_node)
-                    
-            except Exception as e:
-                print(f"      ❌ Exception: {e}")
-                enriched_node = node.copy()
-                enriched_node.update({
-                    'api_accessible': False,
-                    'api_error': str(e)
-                })
-                enriched_nodes.append(enriched_node)
+                        logger.warning("      ❌ API error %s", status_code)
+                        # Keep node but mark as inaccessible
+                        node.api_accessible = False
+                        node.api_error = status_code
+                        enriched_nodes.append(node)
+                        
+                except Exception as e:
+                    logger.warning("      ❌ Exception: %s", e)
+                    node.api_accessible = False
+                    node.api_error = str(e)
+                    enriched_nodes.append(node)
         
         # Filter to only include nodes that match patterns and are accessible
         final_nodes = [n for n in enriched_nodes if 
-                      enhanced_node_filter(n['name'], self.patterns) and
-                      n.get('api_accessible', True)]
+                      self.node_filter(n.name) and
+                      n.api_accessible]
         
         print(f"📊 API nodes after enhanced enrichment: {len(final_nodes)}")
         return final_nodes
@@ -433,20 +608,22 @@ class EnhancedUnifiedMetadataHack:
         print(f"\n>>> CONSOLIDATING ALL TARGET NODES (ENHANCED)")
         print("-" * 50)
         
-        # Combine all nodes
-        all_nodes = api_nodes + ui_nodes
-        
-        # Remove duplicates based on node ID
+        # Remove duplicates based on node ID in a single pass over both sources,
+        # keeping per-source counts of the surviving nodes as we go
         unique_nodes = {}
-        for node in all_nodes:
-            node_id = node['id']
-            if node_id not in unique_nodes:
-                unique_nodes[node_id] = node
-            else:
-                # Keep the one with more complete data
-                existing = unique_nodes[node_id]
-                if node.get('original_data') and not existing.get('original_data'):
+        source_counts = Counter()
+        for source_nodes in (api_nodes, ui_nodes):
+            for node in source_nodes:
+                node_id = node.id
+                existing = unique_nodes.get(node_id)
+                if existing is None:
                     unique_nodes[node_id] = node
+                    source_counts[node.source] += 1
+                elif node.original_data and not existing.original_data:
+                    # Keep the one with more complete data
+                    unique_nodes[node_id] = node
+                    source_counts[existing.source] -= 1
+                    source_counts[node.source] += 1
         
         final_nodes = list(unique_nodes.values())
         
@@ -454,8 +631,8 @@ class EnhancedUnifiedMetadataHack:
         self.analyze_node_patterns(final_nodes)
         
         # Summary by source
-        api_count = len([n for n in final_nodes if n['source'] == 'api_migration'])
-        ui_count = len([n for n in final_nodes if n['source'] == 'ui_migration'])
+        api_count = source_counts['api_migration']
+        ui_count = source_counts['ui_migration']
         
         print(f"\n📊 CONSOLIDATED RESULTS (ENHANCED):")
         print(f"   API-migrated nodes: {api_count}")
@@ -464,21 +641,31 @@ class EnhancedUnifiedMetadataHack:
         
         return final_nodes
 
+    def _put_node(self, node_id, node_data):
+        """PUT node data back, serializing the body with orjson when available"""
+        url = self._nodes_url_prefix + node_id
+        if self.limiter:
+            self.limiter.acquire()
+        if orjson is not None:
+            return self.session.put(url, data=orjson.dumps(node_data), timeout=API_TIMEOUT)
+        return self.session.put(url, json=node_data, timeout=API_TIMEOUT)
+
     def apply_enhanced_hack(self, node, dry_run=True):
         """Apply metadata refresh hack to any node (API or UI source) with enhanced logging"""
-        node_id = node['id']
-        node_name = node['name']
-        source = node['source']
+        node_id = node.id
+        node_name = node.name
+        source = node.source
 
         # Special logging for satellites
-        is_satellite = node_name.upper().startswith("S_") and "_CURRENT" in node_name.upper()
+        is_satellite = node.is_satellite
         node_type_indicator = "🛰️ SATELLITE" if is_satellite else "📦 NODE"
+        node_kind = "satellite" if is_satellite else "node"
 
-        print(f"   [PROCESSING] {node_type_indicator} '{node_name}' ({source}) ({str(node_id)[:8]}...)")
+        logger.info("   [PROCESSING] %s '%s' (%s) (%s...)", node_type_indicator, node_name, source, str(node_id)[:8])
 
         # Check if node is accessible
-        if node.get('api_accessible') == False:
-            print(f"        ❌ Not accessible via API")
+        if not node.api_accessible:
+            logger.warning("        ❌ Not accessible via API")
             return {
                 'success': False,
                 'node_id': node_id,
@@ -489,7 +676,7 @@ class EnhancedUnifiedMetadataHack:
             }
 
         if dry_run:
-            print(f"        [DRY RUN] Would hack {source} {node_type_indicator.split()[1].lower()} '{node_name}'")
+            logger.info("        [DRY RUN] Would hack %s %s '%s'", source, node_kind, node_name)
             return {
                 'success': True,
                 'dry_run': True,
@@ -501,42 +688,35 @@ class EnhancedUnifiedMetadataHack:
 
         try:
             # Get current node data (either from cache or API)
-            if node.get('original_data'):
-                current_data = node['original_data']
+            if node.original_data:
+                current_data = node.original_data
             else:
-                # Need to fetch current data
-                response = requests.get(
-                    f"{self.base_url}/api/v1/workspaces/{self.target_workspace}/nodes/{node_id}",
-                    headers=self.headers,
-                    timeout=30
-                )
-                if response.status_code != 200:
+                # Need to fetch current data (reuses enrichment's fetch when still fresh)
+                status_code, current_data = self._get_node(node_id)
+                if current_data is None:
                     return {
                         'success': False,
                         'node_id': node_id,
                         'node_name': node_name,
-                        'error': f'Failed to fetch current data: {response.status_code}',
+                        'error': f'Failed to fetch current data: {status_code}',
                         'is_satellite': is_satellite
                     }
-                current_data = response.json().get('data', response.json())
 
             original_description = current_data.get('description', '')
             
             # Step 1: Make cosmetic change
-            print(f"        [STEP 1] Applying cosmetic change to {node_type_indicator.split()[1].lower()}...")
-            modified_data = current_data.copy()
-            modified_data['description'] = original_description + " "  # Add space
-
-            response = requests.put(
-                f"{self.base_url}/api/v1/workspaces/{self.target_workspace}/nodes/{node_id}",
-                headers=self.headers,
-                json=modified_data,
-                timeout=API_TIMEOUT
-            )
+            logger.debug("        [STEP 1] Applying cosmetic change to %s...", node_kind)
+            # Mutate in place rather than copying; the description is put
+            # back straight after the PUT so the dict is left as fetched
+            current_data['description'] = original_description + " "  # Add space
+            try:
+                response = self._put_node(node_id, current_data)
+            finally:
+                current_data['description'] = original_description
 
             if response.status_code not in [200, 201]:
                 error_msg = f'Failed to apply change: {response.status_code}'
-                print(f"        ❌ Step 1 failed: {error_msg}")
+                logger.warning("        ❌ Step 1 failed: %s", error_msg)
                 return {
                     'success': False,
                     'node_id': node_id,
@@ -546,35 +726,34 @@ class EnhancedUnifiedMetadataHack:
                     'is_satellite': is_satellite
                 }
 
-            time.sleep(1)  # Brief pause
-
-            # Step 2: Revert to original
-            print(f"        [STEP 2] Reverting to original...")
-            current_data['description'] = original_description
+            # Step 2: Revert to original (the step 1 PUT has already been
+            # acknowledged, so no pause is needed before reverting)
+            if self.single_put:
+                logger.debug("        [STEP 2] Skipped (single-PUT mode, trailing space kept)")
+            else:
+                logger.debug("        [STEP 2] Reverting to original...")
+                response = self._put_node(node_id, current_data)
 
-            response = requests.put(
-                f"{self.base_url}/api/v1/workspaces/{self.target_workspace}/nodes/{node_id}",
-                headers=self.headers,
-                json=current_data,
-                timeout=API_TIMEOUT
-            )
+                if response.status_code not in [200, 201]:
+                    error_msg = f'Failed to revert change: {response.status_code}'
+                    logger.warning("        ❌ Step 2 failed: %s", error_msg)
+                    return {
+                        'success': False,
+                        'node_id': node_id,
+                        'node_name': node_name,
+                        'error': error_msg,
+                        'step': 'revert_change',
+                        'is_satellite': is_satellite
+                    }
 
-            if response.status_code not in [200, 201]:
-                error_msg = f'Failed to revert change: {response.status_code}'
-                print(f"        ❌ Step 2 failed: {error_msg}")
-                return {
-                    'success': False,
-                    'node_id': node_id,
-                    'node_name': node_name,
-                    'error': error_msg,
-                    'step': 'revert_change',
-                    'is_satellite': is_satellite
-                }
+            # The cached copy no longer reflects the node's description
+            self._node_cache.pop(node_id, None)
 
-            success_msg = "✅ Hack completed successfully"
-            if is_satellite:
-                success_msg += " 🛰️ (SATELLITE _CURRENT node fixed!)"
-            print(f"        {success_msg}")
+            if logger.isEnabledFor(logging.DEBUG):
+                success_msg = "✅ Hack completed successfully"
+                if is_satellite:
+                    success_msg += " 🛰️ (SATELLITE _CURRENT node fixed!)"
+                logger.debug("        %s", success_msg)
 
             return {
                 'success': True,
@@ -582,12 +761,13 @@ class EnhancedUnifiedMetadataHack:
                 'node_name': node_name,
                 'source': source,
                 'original_description': original_description,
+                'single_put': self.single_put,
                 'hack_timestamp': datetime.now().isoformat(),
                 'is_satellite': is_satellite
             }
 
         except Exception as e:
-            print(f"        ❌ Exception: {e}")
+            logger.warning("        ❌ Exception: %s", e)
             return {
                 'success': False,
                 'node_id': node_id,
@@ -610,18 +790,27 @@ class EnhancedUnifiedMetadataHack:
             print(f"   [WARNING] No matching nodes found to process!")
             return
 
-        # Count special node types for progress tracking
-        satellites = [n for n in all_nodes if n['name'].upper().startswith("S_") and "_CURRENT" in n['name'].upper()]
-        hubs = [n for n in all_nodes if n['name'].upper().startswith("H_")]
-        links = [n for n in all_nodes if n['name'].upper().startswith("L_")]
-        stages = [n for n in all_nodes if n['name'].upper().startswith("STG_")]
+        # Count special node types for progress tracking in a single pass
+        satellites = hubs = links = stages = other = 0
+        for node in all_nodes:
+            name_u = node.name_u
+            if node.is_satellite:
+                satellites += 1
+            elif name_u.startswith(_HUB_PREFIXES):
+                hubs += 1
+            elif name_u.startswith(_LNK_PREFIXES):
+                links += 1
+            elif name_u.startswith("STG_"):
+                stages += 1
+            else:
+                other += 1
         
         print(f"   📊 Node Type Breakdown:")
-        print(f"      🛰️ Satellites (_CURRENT): {len(satellites)}")
-        print(f"      🔗 Hubs: {len(hubs)}")
-        print(f"      🔗 Links: {len(links)}")
-        print(f"      📦 Stages: {len(stages)}")
-        print(f"      📦 Other: {len(all_nodes) - len(satellites) - len(hubs) - len(links) - len(stages)}")
+        print(f"      🛰️ Satellites (_CURRENT): {satellites}")
+        print(f"      🔗 Hubs: {hubs}")
+        print(f"      🔗 Links: {links}")
+        print(f"      📦 Stages: {stages}")
+        print(f"      📦 Other: {other}")
 
         total_batches = (len(all_nodes) + batch_size - 1) // batch_size
 
@@ -630,28 +819,20 @@ class EnhancedUnifiedMetadataHack:
             end_idx = min(start_idx + batch_size, len(all_nodes))
             batch_nodes = all_nodes[start_idx:end_idx]
 
-            print(f"\n[BATCH {batch_num + 1}/{total_batches}] Processing nodes {start_idx + 1}-{end_idx}")
-
-            for i, node in enumerate(batch_nodes):
-                node_idx = start_idx + i + 1
-                print(f"\n   [{node_idx:3d}/{len(all_nodes)}]")
+            print(f"\n[BATCH {batch_num + 1}/{total_batches}] Processing nodes {start_idx + 1}-{end_idx} concurrently")
 
-                result = self.apply_enhanced_hack(node, dry_run)
-                self.hack_results.append(result)
+            # Hack every node in the batch in parallel; collect results in node order
+            with ThreadPoolExecutor(max_workers=len(batch_nodes)) as executor:
+                futures = [executor.submit(self.apply_enhanced_hack, node, dry_run) for node in batch_nodes]
 
-                if result.get('success', False):
-                    self.successful_fixes.append(result)
-                else:
-                    self.failed_fixes.append(result)
+                for future in futures:
+                    result = future.result()
+                    self.hack_results.append(result)
 
-                # Brief pause between nodes
-                if not dry_run:
-                    time.sleep(0.5)
-
-            # Pause between batches
-            if batch_num < total_batches - 1 and not dry_run:
-                print(f"   [BATCH COMPLETE] Pausing 3 seconds...")
-                time.sleep(3)
+                    if result.get('success', False):
+                        self.successful_fixes.append(result)
+                    else:
+                        self.failed_fixes.append(result)
 
     def save_enhanced_results(self):
         """Save comprehensive results for enhanced unified hack"""
@@ -698,16 +879,27 @@ class EnhancedUnifiedMetadataHack:
                 'satellite_success_rate': (len(satellite_successes) / (len(satellite_successes) + len(satellite_failures)) * 100) if (satellite_successes or satellite_failures) else 0,
                 'satellite_nodes': [{'name': r['node_name'], 'source': r.get('source'), 'success': True} for r in satellite_successes] + 
                                  [{'name': r['node_name'], 'source': r.get('source'), 'success': False, 'error': r.get('error')} for r in satellite_failures]
-            },
-            'detailed_results': {
-                'successful_fixes': self.successful_fixes,
-                'failed_fixes': self.failed_fixes,
-                'all_hack_attempts': self.hack_results
             }
         }
 
-        with open(filename, 'w') as f:
-            json.dump(results, f, indent=2)
+        # Write the summary sections key by key, then stream the per-node
+        # attempts into the all_hack_attempts array one compact record at a
+        # time rather than serializing them as part of one big document.
+        # Successes and failures are not repeated in separate lists; filter
+        # all_hack_attempts on its 'success' field instead.
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write('{')
+            for key, value in results.items():
+                # Raw newlines only occur between tokens, so re-indenting is safe
+                section = _to_json(value, indent=True).replace('\n', '\n  ')
+                f.write(f'\n  {_to_json(key)}: {section},')
+            f.write('\n  "detailed_results": {\n    "all_hack_attempts": [')
+            separator = '\n      '
+            for result in self.hack_results:
+                f.write(separator)
+                f.write(_to_json(result))
+                separator = ',\n      '
+            f.write('\n    ]\n  }\n}\n')
 
         print(f"\n>> Enhanced detailed results saved to: {filename}")
         return filename
@@ -769,8 +961,8 @@ class EnhancedUnifiedMetadataHack:
 
         if dry_run:
             print(f"[DRY RUN] Would hack {len(all_target_nodes)} Data Vault nodes total")
-            api_count = len([n for n in all_target_nodes if n['source'] == 'api_migration'])
-            ui_count = len([n for n in all_target_nodes if n['source'] == 'ui_migration'])
+            api_count = len([n for n in all_target_nodes if n.source == 'api_migration'])
+            ui_count = len([n for n in all_target_nodes if n.source == 'ui_migration'])
             print(f"   API-migrated: {api_count} nodes")
             print(f"   UI-migrated: {ui_count} nodes")
             if satellites_processed > 0:
@@ -805,6 +997,15 @@ class EnhancedUnifiedMetadataHack:
         return len(self.successful_fixes) > 0
 
 
+def _configure_logging(verbose=False):
+    """Log progress to stdout as plain lines, including per-node detail when verbose"""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.handlers[:] = [handler]
+    logger.setLevel(logging.DEBUG if verbose else logging.INFO)
+    logger.propagate = False
+
+
 def main():
     """Main execution function with enhanced options"""
     parser = argparse.ArgumentParser(description='Enhanced Unified Metadata Refresh Hack for All Data Vault Node Types')
@@ -813,8 +1014,15 @@ def main():
     parser.add_argument('--patterns', type=str, default='all-dv', 
                        help='Node patterns: "all-dv" for all DV types, or comma-separated like "S_,H_,L_,STG_"')
     parser.add_argument('--batch-size', type=int, default=5, help='Batch size (default: 5)')
+    parser.add_argument('--single-put', action='store_true',
+                       help='Use one PUT per node (trailing space kept) instead of change + revert')
+
+    parser.add_argument('--max-rps', type=float, default=MAX_REQUESTS_PER_SECOND,
+                       help=f'Max API requests per second, 0 for unlimited (default: {MAX_REQUESTS_PER_SECOND})')
+    parser.add_argument('--verbose', action='store_true', help='Show per-node progress detail')
 
     args = parser.parse_args()
+    _configure_logging(args.verbose)
 
     # Parse patterns
     if args.patterns == 'all-dv':
@@ -826,11 +1034,14 @@ def main():
     execute_mode = args.execute and not args.dry_run
 
     try:
-        hack_tool = EnhancedUnifiedMetadataHack(patterns=patterns)
+        hack_tool = EnhancedUnifiedMetadataHack(patterns=patterns, single_put=args.single_put,
+                                                max_rps=args.max_rps)
 
         print(f"\n>>> ENHANCED CONFIGURATION:")
         print(f"   Mode: {'EXECUTE' if execute_mode else 'DRY RUN'}")
         print(f"   Batch size: {args.batch_size}")
+        print(f"   Rate limit: {f'{args.max_rps:g} requests/sec' if args.max_rps else 'none'}")
+        print(f"   PUTs per node: {'1 (single-PUT)' if args.single_put else '2 (change + revert)'}")
         print(f"   Patterns: {'/'.join(patterns) if patterns != ['all-dv'] else 'ALL Data Vault Types'}")
         print(f"   Workspace: {TARGET_WORKSPACE_ID}")
         print(f"   Approach: Enhanced unified (API + UI nodes)")
@@ -10,21 +10,104 @@ This approach:
 4. More precise than discovery-based approach
 """
 
-import requests
 import json
-import glob
 import time
 import os
+import sys
+import logging
+import sqlite3
+import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dotenv import load_dotenv
-from coalesce_conn import load_config_from_env
+from coalesce_conn import load_config_from_env, create_session, RateLimiter, response_json
 from migration_config import get_migration_config, get_project_info
 
+# Optional: incremental JSON parsing for very large migration result files
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Optional: faster JSON encoding/decoding (stdlib json is used when missing)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+MAX_CONCURRENT_REQUESTS = 16  # Parallel node-detail GETs during enrichment
+MAX_REQUESTS_PER_SECOND = 8  # Sustained API request rate across all threads
+RATE_LIMIT_BURST = 10  # Requests allowed through at once before pacing kicks in
+MAX_RETRIES = 5  # Retries for 429/5xx responses before a node is recorded as failed
+RETRY_BACKOFF_FACTOR = 1.5  # Exponential backoff base (seconds) between retries
+BULK_PAGE_SIZE = 500  # Nodes per page when listing the workspace for --bulk-fetch
+ENRICH_PROGRESS_EVERY = 50  # Print an enrichment progress line every this many nodes
+ENRICH_CACHE_TTL = 3600  # Seconds a cached node payload is reused (dry runs only)
+STREAM_THRESHOLD_BYTES = 50 << 20  # Stream result files at least this large (needs ijson)
+
+# Per-node hack progress; hacks run on worker threads, and a logging handler
+# writes each line atomically where print() output would interleave
+logger = logging.getLogger('migration_hack')
+
+
+def _load_json_file(file):
+    """Parse a JSON file, using orjson on the raw bytes when available"""
+    if orjson is not None:
+        with open(file, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(file, 'r') as f:
+        return json.load(f)
+
+
+def _dump_json_file(data, file):
+    """Write data to a JSON file with 2-space indentation"""
+    if orjson is not None:
+        with open(file, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(file, 'w') as f:
+            json.dump(data, f, indent=2)
+
+
+def _dumps(data):
+    """Serialize data to compact JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode()
+
+
+def _loads(payload):
+    """Parse JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def _read_creation_result(file):
+    """
+    Return (created_nodes, node_id_mapping) from a migration result file.
+    Files of STREAM_THRESHOLD_BYTES or more are streamed with ijson when it
+    is installed, so the rest of the document is never materialized.
+    """
+    if ijson is not None and os.path.getsize(file) >= STREAM_THRESHOLD_BYTES:
+        with open(file, 'rb') as f:
+            created_nodes = list(ijson.items(
+                f, 'creation_result.created_nodes.item', use_float=True))
+            if created_nodes:
+                return created_nodes, {}
+            f.seek(0)
+            return [], dict(ijson.kvitems(f, 'creation_result.node_id_mapping'))
+
+    data = _load_json_file(file)
+    creation_result = data.get('creation_result', {})
+    return (creation_result.get('created_nodes', []),
+            creation_result.get('node_id_mapping', {}))
+
 
 class MigrationBasedMetadataHack:
     """Metadata refresh hack using existing migration data"""
 
-    def __init__(self):
+    def __init__(self, single_put=False):
         load_dotenv()
         config_data = load_config_from_env()
 
@@ -32,13 +115,14 @@ class MigrationBasedMetadataHack:
             raise RuntimeError("[ERROR] Could not load API config")
 
         self.base_url = config_data.get('base_url', '').rstrip('/')
-        self.access_token = config_data.get('access_token')
 
-        self.headers = {
-            'Authorization': f'Bearer {self.access_token}',
-            'Accept': 'application/json',
-            'Content-Type': 'application/json'
-        }
+        # Pooled keep-alive session shared by all GETs/PUTs (thread-safe for our use),
+        # carrying the auth and JSON headers; transient 429/5xx responses are
+        # retried with exponential backoff
+        self.session = create_session(config_data, pool_maxsize=MAX_CONCURRENT_REQUESTS,
+                                      retries=MAX_RETRIES, backoff_factor=RETRY_BACKOFF_FACTOR)
+        # Client-side token bucket so concurrent workers stay under the API's rate limit
+        self.limiter = RateLimiter(MAX_REQUESTS_PER_SECOND, burst=RATE_LIMIT_BURST)
 
         # Load migration configuration
         self.migration_config = get_migration_config()
@@ -46,17 +130,35 @@ class MigrationBasedMetadataHack:
         self.target_workspace = self.migration_config.get(
             "target", {}).get("workspace_id")
 
+        # Single-PUT mode leaves the trailing space in place instead of reverting it
+        self.single_put = single_put
+
+        # Local cache of fetched node payloads, so repeated dry runs skip the API
+        self.cache_path = f".enrich_cache_{self.target_workspace}.sqlite"
+
         # Results tracking
         self.migrated_nodes = []
         self.hack_results = []
-        self.successful_fixes = []
-        self.failed_fixes = []
+        # Success/failure counts; the per-result split is built only when saving
+        self.n_success = 0
+        self.n_failed = 0
 
         print(
             f">>> {self.project_info['name'].upper()} MIGRATION-BASED METADATA HACK")
         print(f"   Target Workspace: {self.target_workspace}")
         print(f"   Strategy: Use existing migration data to identify problematic nodes")
 
+    def close(self):
+        """Release the pooled HTTP connections"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
     def find_migration_result_files(self):
         """Find migration result files containing node mapping data"""
         print(f"\n>>> FINDING MIGRATION RESULT FILES")
@@ -69,23 +171,33 @@ class MigrationBasedMetadataHack:
             "*creation_result*.json",
             "*migrated*.json"
         ]
-
-        found_files = []
-        for pattern in patterns:
-            files = glob.glob(pattern)
+        substrings = [pattern[1:-6] for pattern in patterns]
+
+        # One directory pass; DirEntry caches the stat used for sorting below
+        mtimes = {}
+        with os.scandir('.') as entries:
+            for entry in entries:
+                name = entry.name
+                if (not name.startswith('.') and name.endswith('.json')
+                        and any(sub in name for sub in substrings) and entry.is_file()):
+                    mtimes[name] = entry.stat().st_mtime
+
+        for pattern, sub in zip(patterns, substrings):
+            files = [name for name in mtimes if sub in name]
             if files:
-                found_files.extend(files)
                 print(f"   Pattern '{pattern}': {len(files)} files")
                 for file in files:
                     print(f"      - {file}")
 
+        found_files = list(mtimes)
+
         if not found_files:
             print(f"   [ERROR] No migration result files found!")
             print(f"   Expected files: *created_nodes*.json or similar")
             return []
 
         # Sort by modification time (newest first)
-        found_files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
+        found_files.sort(key=mtimes.get, reverse=True)
 
         print(
             f"\n   [SUCCESS] Found {len(found_files)} migration result files")
@@ -100,16 +212,11 @@ class MigrationBasedMetadataHack:
 
         for file in result_files:
             try:
-                with open(file, 'r') as f:
-                    data = json.load(f)
+                # Try different data structures
+                created_nodes, node_id_mapping = _read_creation_result(file)
 
                 print(f"\n   >> Processing: {file}")
 
-                # Try different data structures
-                creation_result = data.get('creation_result', {})
-                created_nodes = creation_result.get('created_nodes', [])
-                node_id_mapping = creation_result.get('node_id_mapping', {})
-
                 if created_nodes:
                     print(f"      Found {len(created_nodes)} created nodes")
                     all_migrated_nodes.extend(created_nodes)
@@ -131,61 +238,185 @@ class MigrationBasedMetadataHack:
             except Exception as e:
                 print(f"      [ERROR] Error loading {file}: {e}")
 
-        # Remove duplicates based on new_id
-        unique_nodes = {}
-        for node in all_migrated_nodes:
-            new_id = node.get('new_id')
-            if new_id and new_id not in unique_nodes:
-                unique_nodes[new_id] = node
-
-        final_nodes = list(unique_nodes.values())
+        # Remove duplicates based on new_id with C-level dict building: the
+        # reversed pass lets the first-seen node win, and dict.fromkeys keeps
+        # first-seen order
+        new_ids = [node.get('new_id') for node in all_migrated_nodes]
+        unique_nodes = dict(zip(reversed(new_ids), reversed(all_migrated_nodes)))
+        final_nodes = [unique_nodes[new_id]
+                       for new_id in dict.fromkeys(new_ids) if new_id]
         print(
             f"\n   [SUMMARY] Loaded {len(final_nodes)} unique migrated nodes")
 
         return final_nodes
 
-    def enrich_node_data(self, migrated_nodes):
-        """Get current details for all migrated nodes"""
-        print(f"\n>>> ENRICHING NODE DATA FROM API")
-        print("-" * 50)
-
-        enriched_nodes = []
-
-        for i, node in enumerate(migrated_nodes, 1):
-            new_id = node.get('new_id')
-            print(
-                f"   {i:3d}/{len(migrated_nodes)}: Getting details for {new_id[:8]}...")
-
+    def _fetch_node(self, node_id):
+        """GET current details for one node; returns (status_code, node_info or None)"""
+        self.limiter.acquire()
+        response = self.session.get(
+            f"{self.base_url}/api/v1/workspaces/{self.target_workspace}/nodes/{node_id}",
+            timeout=30
+        )
+
+        if response.status_code != 200:
+            return response.status_code, None
+
+        current_data = response_json(response)
+        return response.status_code, current_data.get('data', current_data)
+
+    def _bulk_fetch_nodes(self, node_ids):
+        """
+        Fetch details for many nodes from the paginated workspace node list
+        (detail=true) instead of one GET per node. Returns {node_id: node_info}
+        for the requested ids that were found; callers GET the rest one by one.
+        """
+        wanted = set(node_ids)
+        found = {}
+        params = {'detail': 'true', 'limit': BULK_PAGE_SIZE}
+
+        while wanted:
+            self.limiter.acquire()
             try:
-                response = requests.get(
-                    f"{self.base_url}/api/v1/workspaces/{self.target_workspace}/nodes/{new_id}",
-                    headers=self.headers,
-                    timeout=30
+                response = self.session.get(
+                    f"{self.base_url}/api/v1/workspaces/{self.target_workspace}/nodes",
+                    params=params,
+                    timeout=60
                 )
+            except requests.RequestException as e:
+                print(f"   [WARNING] Bulk node listing failed ({e}), falling back to per-node requests")
+                break
+            if response.status_code != 200:
+                print(f"   [WARNING] Bulk node listing failed ({response.status_code}), "
+                      f"falling back to per-node requests")
+                break
+
+            page = response_json(response)
+            for node_info in page.get('data', []):
+                node_id = node_info.get('id')
+                if node_id in wanted:
+                    found[node_id] = node_info
+                    wanted.discard(node_id)
+
+            next_cursor = page.get('next')
+            if not next_cursor:
+                break
+            params['startingFrom'] = next_cursor
+
+        return found
+
+    def _open_enrich_cache(self):
+        """Open (creating if needed) the on-disk node payload cache"""
+        cache = sqlite3.connect(self.cache_path)
+        cache.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(node_id TEXT PRIMARY KEY, payload BLOB, fetched_at REAL)")
+        return cache
+
+    def _load_cached_nodes(self, cache, node_ids, ttl=ENRICH_CACHE_TTL):
+        """Return {node_id: node_info} for cached payloads younger than ttl seconds"""
+        cutoff = time.time() - ttl
+        found = {}
+        node_ids = list(node_ids)
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(node_ids), 500):
+            chunk = node_ids[start:start + 500]
+            rows = cache.execute(
+                f"SELECT node_id, payload FROM cache WHERE fetched_at >= ? "
+                f"AND node_id IN ({','.join('?' * len(chunk))})",
+                [cutoff] + chunk)
+            for node_id, payload in rows:
+                found[node_id] = _loads(payload)
+        return found
+
+    def _store_cached_nodes(self, cache, fetched):
+        """Save freshly fetched {node_id: node_info} payloads to the cache"""
+        now = time.time()
+        with cache:
+            cache.executemany(
+                "INSERT OR REPLACE INTO cache (node_id, payload, fetched_at) VALUES (?, ?, ?)",
+                [(node_id, _dumps(node_info), now) for node_id, node_info in fetched.items()])
+
+    def enrich_node_data(self, migrated_nodes, max_workers=MAX_CONCURRENT_REQUESTS, bulk=False,
+                         use_cache=False):
+        """
+        Get current details for all migrated nodes.
+        With use_cache, fresh payloads from the local cache are used instead of
+        fetching and fetched payloads are written back; without it the cache
+        is neither opened nor written.
+        """
+        print(f"\n>>> ENRICHING NODE DATA FROM API")
+        print("-" * 50)
 
-                if response.status_code == 200:
-                    current_data = response.json()
-                    node_info = current_data.get('data', current_data)
-
-                    # Merge migration info with current API data
-                    enriched_node = {
-                        'migration_info': node,
-                        'current_data': node_info,
-                        'id': new_id,
-                        'name': node_info.get('name', f'Node_{new_id}'),
-                        'type': node_info.get('type', 'Unknown'),
-                        'description': node_info.get('description', ''),
-                        'api_accessible': True
-                    }
-
-                    enriched_nodes.append(enriched_node)
-                    print(
-                        f"        ✅ '{enriched_node['name']}' (Type: {enriched_node['type']})")
-
-                else:
-                    print(f"        ❌ API error {response.status_code}")
-                    # Still add to list but mark as inaccessible
-                    enriched_nodes.append({
+        total = len(migrated_nodes)
+        enriched_nodes = [None] * total
+        node_ids = [node.get('new_id') for node in migrated_nodes]
+
+        cache = None
+        prefetched = {}
+        if use_cache:
+            cache = self._open_enrich_cache()
+            prefetched = self._load_cached_nodes(cache, node_ids)
+            print(f"   Cache hits: {len(prefetched)}/{len(migrated_nodes)} nodes")
+        fetched = {}
+
+        if bulk:
+            missing = [node_id for node_id in node_ids if node_id not in prefetched]
+            bulk_nodes = self._bulk_fetch_nodes(missing) if missing else {}
+            print(f"   Bulk listing returned {len(bulk_nodes)}/{len(missing)} nodes")
+            prefetched.update(bulk_nodes)
+            fetched.update(bulk_nodes)
+
+        # Issue the remaining GETs concurrently; results are consumed in the original node order
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [None if node.get('new_id') in prefetched
+                       else executor.submit(self._fetch_node, node.get('new_id'))
+                       for node in migrated_nodes]
+
+            for i, (node, future) in enumerate(zip(migrated_nodes, futures)):
+                new_id = node.get('new_id')
+                done = i + 1
+                if done % ENRICH_PROGRESS_EVERY == 0 or done == total:
+                    print(f"   {done:3d}/{total}: node details fetched")
+
+                try:
+                    if future is None:
+                        status_code, node_info = 200, prefetched[new_id]
+                    else:
+                        status_code, node_info = future.result()
+                        if node_info is not None:
+                            fetched[new_id] = node_info
+
+                    if node_info is not None:
+                        # Merge migration info with current API data
+                        enriched_node = {
+                            'migration_info': node,
+                            'current_data': node_info,
+                            'id': new_id,
+                            'name': node_info.get('name', f'Node_{new_id}'),
+                            'type': node_info.get('type', 'Unknown'),
+                            'description': node_info.get('description', ''),
+                            'api_accessible': True
+                        }
+
+                        enriched_nodes[i] = enriched_node
+
+                    else:
+                        print(f"        ❌ {new_id[:8]}...: API error {status_code}")
+                        # Still add to list but mark as inaccessible
+                        enriched_nodes[i] = {
+                            'migration_info': node,
+                            'current_data': None,
+                            'id': new_id,
+                            'name': node.get('name', f'Node_{new_id}'),
+                            'type': 'Unknown',
+                            'description': '',
+                            'api_accessible': False,
+                            'api_error': status_code
+                        }
+
+                except Exception as e:
+                    print(f"        ❌ {new_id[:8]}...: Exception: {e}")
+                    enriched_nodes[i] = {
                         'migration_info': node,
                         'current_data': None,
                         'id': new_id,
@@ -193,21 +424,14 @@ class MigrationBasedMetadataHack:
                         'type': 'Unknown',
                         'description': '',
                         'api_accessible': False,
-                        'api_error': response.status_code
-                    })
+                        'api_error': str(e)
+                    }
 
-            except Exception as e:
-                print(f"        ❌ Exception: {e}")
-                enriched_nodes.append({
-                    'migration_info': node,
-                    'current_data': None,
-                    'id': new_id,
-                    'name': node.get('name', f'Node_{new_id}'),
-                    'type': 'Unknown',
-                    'description': '',
-                    'api_accessible': False,
-                    'api_error': str(e)
-                })
+        if cache is not None:
+            try:
+                self._store_cached_nodes(cache, fetched)
+            finally:
+                cache.close()
 
         accessible_count = len(
             [n for n in enriched_nodes if n['api_accessible']])
@@ -216,13 +440,17 @@ class MigrationBasedMetadataHack:
 
         return enriched_nodes
 
-    def apply_targeted_hack(self, node, dry_run=True):
-        """Apply metadata refresh hack to a specific migrated node"""
+    def apply_targeted_hack(self, node, dry_run=True, hack_timestamp=None):
+        """
+        Apply metadata refresh hack to a specific migrated node.
+        hack_timestamp (ISO string) is recorded on success; batches pass one
+        shared value, otherwise the current time is used.
+        """
         node_id = node['id']
         node_name = node['name']
 
         if not node['api_accessible']:
-            print(f"   [SKIP] '{node_name}' - not accessible via API")
+            logger.info("   [SKIP] '%s' - not accessible via API", node_name)
             return {
                 'success': False,
                 'node_id': node_id,
@@ -232,7 +460,7 @@ class MigrationBasedMetadataHack:
             }
 
         if dry_run:
-            print(f"   [DRY RUN] Would hack '{node_name}' ({node_id[:8]}...)")
+            logger.info("   [DRY RUN] Would hack '%s' (%s...)", node_name, node_id[:8])
             return {
                 'success': True,
                 'dry_run': True,
@@ -241,7 +469,7 @@ class MigrationBasedMetadataHack:
                 'original_description': node.get('description', '')
             }
 
-        print(f"   [HACK] Processing '{node_name}' ({node_id[:8]}...)")
+        logger.info("   [HACK] Processing '%s' (%s...)", node_name, node_id[:8])
 
         try:
             original_description = node.get('description', '')
@@ -253,9 +481,9 @@ class MigrationBasedMetadataHack:
             update_payload = current_data.copy()
             update_payload['description'] = modified_description
 
-            response = requests.put(
+            self.limiter.acquire()
+            response = self.session.put(
                 f"{self.base_url}/api/v1/workspaces/{self.target_workspace}/nodes/{node_id}",
-                headers=self.headers,
                 json=update_payload,
                 timeout=60
             )
@@ -268,38 +496,40 @@ class MigrationBasedMetadataHack:
                     'error': f'Failed to apply change: {response.status_code}'
                 }
 
-            time.sleep(1)  # Brief pause
-
-            # Step 2: Revert change
-            update_payload['description'] = original_description
-
-            response = requests.put(
-                f"{self.base_url}/api/v1/workspaces/{self.target_workspace}/nodes/{node_id}",
-                headers=self.headers,
-                json=update_payload,
-                timeout=60
-            )
+            # Step 2: Revert change (skipped in single-PUT mode, where the
+            # cosmetic PUT alone is enough to refresh the metadata). The step 1
+            # PUT has already been acknowledged, so no pause is needed first.
+            if not self.single_put:
+                update_payload['description'] = original_description
+
+                self.limiter.acquire()
+                response = self.session.put(
+                    f"{self.base_url}/api/v1/workspaces/{self.target_workspace}/nodes/{node_id}",
+                    json=update_payload,
+                    timeout=60
+                )
 
-            if response.status_code not in [200, 201]:
-                return {
-                    'success': False,
-                    'node_id': node_id,
-                    'node_name': node_name,
-                    'error': f'Failed to revert change: {response.status_code}'
-                }
+                if response.status_code not in [200, 201]:
+                    return {
+                        'success': False,
+                        'node_id': node_id,
+                        'node_name': node_name,
+                        'error': f'Failed to revert change: {response.status_code}'
+                    }
 
-            print(f"        ✅ Hack completed successfully")
+            logger.info("        ✅ Hack completed successfully")
 
             return {
                 'success': True,
                 'node_id': node_id,
                 'node_name': node_name,
                 'original_description': original_description,
-                'hack_timestamp': datetime.now().isoformat()
+                'single_put': self.single_put,
+                'hack_timestamp': hack_timestamp or datetime.now().isoformat()
             }
 
         except Exception as e:
-            print(f"        ❌ Exception: {e}")
+            logger.info("        ❌ Exception: %s", e)
             return {
                 'success': False,
                 'node_id': node_id,
@@ -307,7 +537,8 @@ class MigrationBasedMetadataHack:
                 'error': f'Exception: {str(e)}'
             }
 
-    def batch_hack_migrated_nodes(self, enriched_nodes, batch_size=10, dry_run=True):
+    def batch_hack_migrated_nodes(self, enriched_nodes, batch_size=10, dry_run=True,
+                                  max_workers=MAX_CONCURRENT_REQUESTS):
         """Apply hack to all migrated nodes in batches"""
         print(f"\n>>> BATCH HACKING ALL MIGRATED NODES")
         print(f"   Total nodes: {len(enriched_nodes)}")
@@ -327,24 +558,28 @@ class MigrationBasedMetadataHack:
             batch_nodes = hackable_nodes[start_idx:end_idx]
 
             print(
-                f"\n[BATCH {batch_num + 1}/{total_batches}] Processing nodes {start_idx + 1}-{end_idx}")
+                f"\n[BATCH {batch_num + 1}/{total_batches}] Processing nodes {start_idx + 1}-{end_idx} concurrently")
 
-            for i, node in enumerate(batch_nodes):
-                node_idx = start_idx + i + 1
-                print(
-                    f"\n   [{node_idx:3d}/{len(hackable_nodes)}] Processing...")
+            # One timestamp for the whole batch rather than one per hack
+            batch_timestamp = datetime.now().isoformat()
 
-                result = self.apply_targeted_hack(node, dry_run)
-                self.hack_results.append(result)
+            # Hack every node in the batch in parallel
+            with ThreadPoolExecutor(max_workers=min(len(batch_nodes), max_workers)) as executor:
+                futures = [executor.submit(self.apply_targeted_hack, node, dry_run, batch_timestamp)
+                           for node in batch_nodes]
 
-                if result.get('success', False):
-                    self.successful_fixes.append(result)
-                else:
-                    self.failed_fixes.append(result)
+                # Results are collected in node order on this thread, so the
+                # result lists need no lock
+                for i, future in enumerate(futures):
+                    result = future.result()
+                    logger.info("   [%3d/%d] %s", start_idx + i + 1, len(hackable_nodes),
+                                "Done" if result.get('success', False) else "Failed")
+                    self.hack_results.append(result)
 
-                # Brief pause between nodes
-                if not dry_run:
-                    time.sleep(0.5)
+                    if result.get('success', False):
+                        self.n_success += 1
+                    else:
+                        self.n_failed += 1
 
             # Pause between batches
             if batch_num < total_batches - 1 and not dry_run:
@@ -356,14 +591,17 @@ class MigrationBasedMetadataHack:
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = f"migration_based_hack_results_{timestamp}.json"
 
+        successful_fixes = [r for r in self.hack_results if r.get('success', False)]
+        failed_fixes = [r for r in self.hack_results if not r.get('success', False)]
+
         results = {
             'hack_summary': {
                 'approach': 'migration_data_based',
                 'total_migrated_nodes': len(self.migrated_nodes),
                 'hackable_nodes': len([r for r in self.hack_results if not r.get('skipped', False)]),
-                'successful_hacks': len(self.successful_fixes),
-                'failed_hacks': len(self.failed_fixes),
-                'success_rate': (len(self.successful_fixes) / len(self.hack_results) * 100) if self.hack_results else 0,
+                'successful_hacks': self.n_success,
+                'failed_hacks': self.n_failed,
+                'success_rate': (self.n_success / len(self.hack_results) * 100) if self.hack_results else 0,
                 'target_workspace': self.target_workspace,
                 'project': self.project_info['name'],
                 'execution_timestamp': datetime.now().isoformat()
@@ -375,19 +613,18 @@ class MigrationBasedMetadataHack:
                 'approach_advantage': 'Targets only API-migrated nodes with high precision'
             },
             'detailed_results': {
-                'successful_fixes': self.successful_fixes,
-                'failed_fixes': self.failed_fixes,
+                'successful_fixes': successful_fixes,
+                'failed_fixes': failed_fixes,
                 'all_hack_attempts': self.hack_results
             }
         }
 
-        with open(filename, 'w') as f:
-            json.dump(results, f, indent=2)
+        _dump_json_file(results, filename)
 
         print(f"\n>> Detailed results saved to: {filename}")
         return filename
 
-    def run_migration_based_hack(self, dry_run=True):
+    def run_migration_based_hack(self, dry_run=True, bulk_fetch=False, use_cache=True):
         """Execute the complete migration-based hack process"""
         print(
             f"\n>>> {self.project_info['name'].upper()} MIGRATION-BASED METADATA HACK")
@@ -412,7 +649,11 @@ class MigrationBasedMetadataHack:
         self.migrated_nodes = migrated_nodes
 
         # Step 3: Enrich with current API data
-        enriched_nodes = self.enrich_node_data(migrated_nodes)
+        # The enrichment cache only applies to dry runs; a real run PUTs the
+        # payload back, so it must start from the node's current state and
+        # doesn't touch the cache at all
+        enriched_nodes = self.enrich_node_data(
+            migrated_nodes, bulk=bulk_fetch, use_cache=dry_run and use_cache)
 
         # Step 4: Apply hack to all migrated nodes
         self.batch_hack_migrated_nodes(
@@ -434,11 +675,11 @@ class MigrationBasedMetadataHack:
             print(f"   Accessible: {accessible_count} nodes")
         else:
             print(f"[EXECUTED] Processed {len(self.hack_results)} nodes")
-            print(f"   ✅ Successful: {len(self.successful_fixes)} hacks")
-            print(f"   ❌ Failed: {len(self.failed_fixes)} hacks")
+            print(f"   ✅ Successful: {self.n_success} hacks")
+            print(f"   ❌ Failed: {self.n_failed} hacks")
 
             if self.hack_results:
-                success_rate = (len(self.successful_fixes) /
+                success_rate = (self.n_success /
                                 len(self.hack_results)) * 100
                 print(f"   📊 Success rate: {success_rate:.1f}%")
 
@@ -454,7 +695,16 @@ class MigrationBasedMetadataHack:
         print(f"   ✅ Maintains mapping between original and new node IDs")
         print(f"   ✅ Can handle large numbers of nodes efficiently")
 
-        return len(self.successful_fixes) > 0
+        return self.n_success > 0
+
+
+def _configure_logging():
+    """Log hack progress to stdout as plain lines"""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.handlers[:] = [handler]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
 
 
 def main():
@@ -467,18 +717,28 @@ def main():
                         help='Execute hack (default is dry run)')
     parser.add_argument('--batch-size', type=int, default=10,
                         help='Batch size (default: 10)')
+    parser.add_argument('--bulk-fetch', action='store_true',
+                        help='Fetch node details from the paginated workspace node list '
+                             'instead of one request per node')
+    parser.add_argument('--single-put', action='store_true',
+                        help='Use one PUT per node (trailing space kept) instead of change + revert')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Always fetch node details, even on dry runs')
 
     args = parser.parse_args()
+    _configure_logging()
 
     try:
-        hack_tool = MigrationBasedMetadataHack()
-
-        print(f"\n>>> CONFIGURATION:")
-        print(f"   Mode: {'EXECUTE' if args.execute else 'DRY RUN'}")
-        print(f"   Batch size: {args.batch_size}")
-        print(f"   Strategy: Target only API-migrated nodes using migration data")
-
-        success = hack_tool.run_migration_based_hack(dry_run=not args.execute)
+        with MigrationBasedMetadataHack(single_put=args.single_put) as hack_tool:
+            print(f"\n>>> CONFIGURATION:")
+            print(f"   Mode: {'EXECUTE' if args.execute else 'DRY RUN'}")
+            print(f"   Batch size: {args.batch_size}")
+            print(f"   PUTs per node: {'1 (single-PUT)' if args.single_put else '2 (change + revert)'}")
+            print(f"   Strategy: Target only API-migrated nodes using migration data")
+
+            success = hack_tool.run_migration_based_hack(
+                dry_run=not args.execute, bulk_fetch=args.bulk_fetch,
+                use_cache=not args.no_cache)
 
         if success:
             print(f"\n✅ Migration-based hack completed successfully!")
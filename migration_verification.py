@@ -5,19 +5,65 @@ ENHANCED: Now resolves UUIDs to actual node names using pandas dataframes
 Creates comprehensive lookup tables and saves real node names instead of UUIDs
 """
 
-import requests
+import heapq
 import json
 import os
+import sys
+import logging
+import sqlite3
+import threading
 import pandas as pd
+import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import groupby
 from dotenv import load_dotenv
-from coalesce_conn import load_config_from_env
+from coalesce_conn import load_config_from_env, create_session, response_json
 from migration_config import get_migration_config, get_project_info, get_file_pattern, get_subgraphs_for_verification
 
+# Optional: Parquet lookup tables (CSV and JSON are written when it's missing)
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+# Columns of the saved UUID lookup tables
+UUID_LOOKUP_COLUMNS = ['uuid', 'name', 'type', 'workspace_id', 'workspace_name', 'source']
+FAILED_LOOKUP_COLUMNS = ['uuid', 'workspace_id', 'error', 'attempted_methods']
+# Low-cardinality lookup columns: interned while buffering, categorical when saved
+CATEGORICAL_LOOKUP_COLUMNS = ('type', 'workspace_id', 'workspace_name', 'source')
+
+MAX_CONCURRENT_REQUESTS = 16  # Parallel UUID resolutions per subgraph
+REQUEST_TIMEOUT = (5, 10)  # Connect/read timeout in seconds for per-UUID lookups
+MAX_RETRIES = 3  # Retries for 429/5xx responses and connection errors
+RETRY_BACKOFF_FACTOR = 0.5  # Exponential backoff base between retries, in seconds
+CIRCUIT_BREAKER_THRESHOLD = 10  # Consecutive API failures before a workspace's lookups are skipped
+RESOLVE_PROGRESS_EVERY = 500  # Uncached UUIDs between resolution progress lines
+UUID_CACHE_PATH = ".uuid_cache.sqlite"  # Resolved UUIDs persisted across runs
+# Lookup sources worth persisting; assumed names can stem from transient API failures
+CACHEABLE_LOOKUP_SOURCES = ('direct_api', 'cross_workspace', 'workspace_listing')
+BULK_PAGE_SIZE = 500  # Nodes per page when listing a workspace for --bulk-fetch
+VECTORIZED_DIFF_THRESHOLD = 10000  # Source node count above which name diffs run in pandas
+
+# Resolution progress; lookups run on worker threads, and a logging handler
+# writes each line atomically where print() output would interleave. Per-UUID
+# detail is logged at DEBUG so it costs nothing unless --verbose
+logger = logging.getLogger('migration_verification')
+
+def load_uuid_lookup_table(path):
+    """Read a saved UUID lookup table (Parquet, CSV or JSON) back into row dicts"""
+    if path.endswith('.parquet'):
+        lookup_df = pd.read_parquet(path)
+    elif path.endswith('.json'):
+        lookup_df = pd.read_json(path, orient='records', dtype=False)
+    else:
+        lookup_df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    return lookup_df[UUID_LOOKUP_COLUMNS].astype(str).to_dict('records')
+
 class EnhancedNodeComparison:
     """Enhanced node comparison with UUID-to-name resolution using pandas"""
     
-    def __init__(self):
+    def __init__(self, use_cache=True):
         load_dotenv()
         config_data = load_config_from_env()
         
@@ -33,6 +79,13 @@ class EnhancedNodeComparison:
             'Content-Type': 'application/json'
         }
         
+        # Pooled keep-alive session shared by the resolution worker threads
+        self.session = create_session(config_data, pool_maxsize=MAX_CONCURRENT_REQUESTS,
+                                      retries=MAX_RETRIES, backoff_factor=RETRY_BACKOFF_FACTOR)
+        # workspace_id -> consecutive failed lookups (errors and 5xx, not 404s)
+        self._api_failures = {}
+        self._api_failures_lock = threading.Lock()
+        
         # Load from config only
         self.migration_config = get_migration_config()
         self.project_info = get_project_info()
@@ -40,15 +93,37 @@ class EnhancedNodeComparison:
         self.target_workspace = self.migration_config.get("target", {})
         self.verification_pairs = get_subgraphs_for_verification()
         
-        # Enhanced: Initialize pandas dataframes for UUID resolution
-        self.uuid_lookup_df = pd.DataFrame(columns=['uuid', 'name', 'type', 'workspace_id', 'workspace_name', 'source'])
-        self.failed_lookups_df = pd.DataFrame(columns=['uuid', 'workspace_id', 'error', 'attempted_methods'])
+        # workspace_id -> (id, name) of the workspace to try cross-workspace lookups in
+        source_ws = (self.source_workspace.get('workspace_id'), self.source_workspace.get('workspace_name'))
+        target_ws = (self.target_workspace.get('workspace_id'), self.target_workspace.get('workspace_name'))
+        self._other_workspace = {source_ws[0]: target_ws, target_ws[0]: source_ws}
+        
+        # One timestamp shared by every file a run saves; restamped when a run starts
+        self._run_time = datetime.now()
+        self._run_timestamp = self._run_time.strftime('%Y%m%d_%H%M%S')
+        
+        # Enhanced: UUID resolution rows are buffered as plain dicts and only
+        # turned into pandas dataframes once, when the lookup tables are saved
+        self._uuid_lookup_rows = []
+        self._failed_rows = []
+        # uuid -> first lookup row for it, for O(1) resolution lookups
+        self._uuid_index = {}
+        # Guards the rows and index, which worker threads add to
+        self._lookup_lock = threading.Lock()
+        
+        # Rows known without a per-UUID GET, keyed by uuid: resolved by earlier
+        # runs (--refresh skips them) or listed by _bulk_fetch_workspace_nodes
+        self.cache_path = UUID_CACHE_PATH
+        self._cached_rows = self._load_uuid_cache() if use_cache else {}
+        self._cache_saved_count = 0
         
         print(f">>> {self.project_info['name'].upper()} ENHANCED NODE COMPARISON WITH UUID RESOLUTION")
         print(f"   Source: {self.source_workspace.get('workspace_name')} (ID: {self.source_workspace.get('workspace_id')})")
         print(f"   Target: {self.target_workspace.get('workspace_name')} (ID: {self.target_workspace.get('workspace_id')})")
         print(f"   Subgraph pairs from config: {len(self.verification_pairs)}")
         print(f"   🔍 ENHANCED: UUID-to-name resolution with pandas lookup tables")
+        print(f"   💾 UUID cache: {len(self._cached_rows)} UUIDs from {self.cache_path}" if use_cache
+              else f"   💾 UUID cache: refreshing {self.cache_path}")
         
         # DEBUG: Show what subgraphs we're actually comparing
         print(f"\n📋 VERIFICATION PAIRS FROM CONFIG:")
@@ -56,33 +131,174 @@ class EnhancedNodeComparison:
             print(f"   {i}. '{pair['name']}' (Source: {pair['source_id']} → Target: {pair['target_id']})")
 
     def _add_to_uuid_lookup(self, uuid, name, node_type, workspace_id, workspace_name, source):
-        """Add UUID-to-name mapping to pandas dataframe"""
-        new_row = pd.DataFrame([{
+        """Add UUID-to-name mapping to the lookup rows and index"""
+        row = {
             'uuid': str(uuid),
             'name': str(name),
-            'type': str(node_type),
-            'workspace_id': str(workspace_id),
-            'workspace_name': str(workspace_name),
-            'source': str(source)
-        }])
-        self.uuid_lookup_df = pd.concat([self.uuid_lookup_df, new_row], ignore_index=True)
+            'type': sys.intern(str(node_type)),
+            'workspace_id': sys.intern(str(workspace_id)),
+            'workspace_name': sys.intern(str(workspace_name)),
+            'source': sys.intern(str(source))
+        }
+        with self._lookup_lock:
+            self._uuid_lookup_rows.append(row)
+            self._uuid_index.setdefault(row['uuid'], row)
 
     def _add_failed_lookup(self, uuid, workspace_id, error, methods):
         """Track failed UUID lookups"""
-        new_row = pd.DataFrame([{
+        row = {
             'uuid': str(uuid),
             'workspace_id': str(workspace_id),
             'error': str(error),
             'attempted_methods': str(methods)
-        }])
-        self.failed_lookups_df = pd.concat([self.failed_lookups_df, new_row], ignore_index=True)
+        }
+        with self._lookup_lock:
+            self._failed_rows.append(row)
+
+    def _open_uuid_cache(self):
+        """Open (creating if needed) the on-disk UUID cache"""
+        cache = sqlite3.connect(self.cache_path)
+        cache.execute(
+            "CREATE TABLE IF NOT EXISTS uuid_cache "
+            "(workspace_id TEXT, uuid TEXT, name TEXT, type TEXT, workspace_name TEXT, source TEXT, "
+            "PRIMARY KEY (workspace_id, uuid))")
+        return cache
+
+    def _load_uuid_cache(self):
+        """Return {uuid: lookup row} for every UUID resolved by earlier runs"""
+        try:
+            cache = self._open_uuid_cache()
+            try:
+                rows = cache.execute(
+                    "SELECT uuid, name, type, workspace_id, workspace_name, source FROM uuid_cache "
+                    f"WHERE source IN ({','.join('?' * len(CACHEABLE_LOOKUP_SOURCES))})",
+                    CACHEABLE_LOOKUP_SOURCES).fetchall()
+            finally:
+                cache.close()
+        except sqlite3.Error as e:
+            print(f"   ⚠️  Could not read UUID cache {self.cache_path}: {e}")
+            return {}
+        
+        cached = {}
+        for row in rows:
+            cached.setdefault(row[0], dict(zip(UUID_LOOKUP_COLUMNS, row)))
+        return cached
+
+    def _save_uuid_cache(self):
+        """Persist real (not assumed) lookup rows added since the last save, in one transaction"""
+        pending = self._uuid_lookup_rows[self._cache_saved_count:]
+        new_rows = [row for row in pending if row['source'] in CACHEABLE_LOOKUP_SOURCES]
+        if not new_rows:
+            self._cache_saved_count += len(pending)
+            return
+        
+        try:
+            cache = self._open_uuid_cache()
+            try:
+                with cache:
+                    cache.executemany(
+                        "INSERT OR REPLACE INTO uuid_cache "
+                        "(workspace_id, uuid, name, type, workspace_name, source) VALUES (?, ?, ?, ?, ?, ?)",
+                        [(row['workspace_id'], row['uuid'], row['name'], row['type'],
+                          row['workspace_name'], row['source']) for row in new_rows])
+            finally:
+                cache.close()
+        except sqlite3.Error as e:
+            print(f"   ⚠️  Could not update UUID cache {self.cache_path}: {e}")
+            return
+        self._cache_saved_count += len(pending)
+
+    def _bulk_fetch_workspace_nodes(self, workspace_id, workspace_name):
+        """
+        List every node of a workspace from the paginated node list, so UUIDs
+        resolve without one GET each. Listed nodes only reach the lookup
+        tables once a subgraph actually references them.
+        """
+        params = {'limit': BULK_PAGE_SIZE}
+        listed = 0
+        
+        while True:
+            try:
+                response = self.session.get(
+                    f"{self.base_url}/api/v1/workspaces/{workspace_id}/nodes",
+                    params=params,
+                    timeout=60
+                )
+            except requests.RequestException as e:
+                print(f"   ⚠️  Node listing for {workspace_name} failed ({e}), "
+                      f"falling back to per-UUID requests")
+                break
+            if response.status_code != 200:
+                print(f"   ⚠️  Node listing for {workspace_name} failed ({response.status_code}), "
+                      f"falling back to per-UUID requests")
+                break
+            
+            page = response_json(response)
+            for node_info in page.get('data', []):
+                uuid_str = str(node_info.get('id'))
+                listed += 1
+                # Fresh listings replace rows from earlier runs; the first
+                # workspace to list a UUID keeps it, as with direct lookups
+                existing = self._cached_rows.get(uuid_str)
+                if existing and existing['source'] == 'workspace_listing':
+                    continue
+                self._cached_rows[uuid_str] = {
+                    'uuid': uuid_str,
+                    'name': str(node_info.get('name', f'Node_{uuid_str}')),
+                    'type': str(node_info.get('type', 'Unknown')),
+                    'workspace_id': str(workspace_id),
+                    'workspace_name': str(workspace_name),
+                    'source': 'workspace_listing'
+                }
+            
+            next_cursor = page.get('next')
+            if not next_cursor:
+                break
+            params['startingFrom'] = next_cursor
+        
+        print(f"   📋 Listed {listed} nodes in {workspace_name}")
+        return listed
+
+    def seed_uuid_lookup(self, path):
+        """Resolve UUIDs from a lookup table saved by an earlier run without API calls"""
+        rows = load_uuid_lookup_table(path)
+        for row in rows:
+            self._cached_rows[row['uuid']] = row
+        print(f"   💾 Seeded {len(rows)} UUIDs from {path}")
+        return len(rows)
+
+    def _get_node(self, workspace_id, uuid_str):
+        """
+        GET one node, tracking consecutive failures per workspace. Once a
+        workspace reaches CIRCUIT_BREAKER_THRESHOLD its remaining lookups fail
+        immediately instead of each waiting out retries and timeouts.
+        """
+        if self._api_failures.get(workspace_id, 0) >= CIRCUIT_BREAKER_THRESHOLD:
+            raise RuntimeError(f"skipped, workspace {workspace_id} API is failing")
+        
+        try:
+            response = self.session.get(
+                f"{self.base_url}/api/v1/workspaces/{workspace_id}/nodes/{uuid_str}",
+                timeout=REQUEST_TIMEOUT
+            )
+        except Exception:
+            self._record_api_result(workspace_id, False)
+            raise
+        self._record_api_result(workspace_id, response.status_code < 500)
+        return response
+
+    def _record_api_result(self, workspace_id, ok):
+        """Reset or bump a workspace's consecutive failure count"""
+        with self._api_failures_lock:
+            failures = 0 if ok else self._api_failures.get(workspace_id, 0) + 1
+            self._api_failures[workspace_id] = failures
+        if failures == CIRCUIT_BREAKER_THRESHOLD:
+            print(f"   ⚠️  {failures} consecutive API failures for workspace {workspace_id}, "
+                  f"skipping its remaining lookups")
 
     def _lookup_uuid_in_dataframe(self, uuid):
-        """Look up UUID in our pandas dataframe"""
-        matches = self.uuid_lookup_df[self.uuid_lookup_df['uuid'] == str(uuid)]
-        if not matches.empty:
-            return matches.iloc[0].to_dict()
-        return None
+        """Look up UUID in our lookup index (first row added for it wins)"""
+        return self._uuid_index.get(str(uuid))
 
     def _resolve_uuid_to_name(self, uuid, workspace_id, workspace_name):
         """Enhanced UUID resolution with multiple fallback methods"""
@@ -91,88 +307,113 @@ class EnhancedNodeComparison:
         # Method 1: Check our existing lookup table
         existing = self._lookup_uuid_in_dataframe(uuid_str)
         if existing:
-            print(f"     🔍 Found in cache: {uuid_str[:8]}... → '{existing['name']}'")
+            logger.debug("     🔍 Found in cache: %s... → '%s'", uuid_str[:8], existing['name'])
             return existing['name'], existing['type']
         
+        # Method 1b: Resolved by an earlier run
+        cached = self._cached_rows.get(uuid_str)
+        if cached:
+            self._add_to_uuid_lookup(uuid_str, cached['name'], cached['type'], cached['workspace_id'],
+                                     cached['workspace_name'], cached['source'])
+            logger.debug("     💾 Found in UUID cache: %s... → '%s'", uuid_str[:8], cached['name'])
+            return cached['name'], cached['type']
+        
         # Method 2: Direct API lookup
         methods_tried = []
         try:
-            response = requests.get(
-                f"{self.base_url}/api/v1/workspaces/{workspace_id}/nodes/{uuid_str}",
-                headers=self.headers,
-                timeout=30
-            )
+            response = self._get_node(workspace_id, uuid_str)
             methods_tried.append(f"direct_api_{workspace_id}")
             
             if response.status_code == 200:
-                node_data = response.json()
+                node_data = response_json(response)
                 node_info = node_data.get('data', node_data)
                 real_name = node_info.get('name', f'Node_{uuid_str}')
                 node_type = node_info.get('type', 'Unknown')
                 
                 # Add to lookup table
                 self._add_to_uuid_lookup(uuid_str, real_name, node_type, workspace_id, workspace_name, 'direct_api')
-                print(f"     ✅ Resolved: {uuid_str[:8]}... → '{real_name}' (Type: {node_type})")
+                logger.debug("     ✅ Resolved: %s... → '%s' (Type: %s)", uuid_str[:8], real_name, node_type)
                 return real_name, node_type
             else:
-                print(f"     ⚠️  API returned {response.status_code} for {uuid_str[:8]}...")
+                logger.debug("     ⚠️  API returned %s for %s...", response.status_code, uuid_str[:8])
                 
         except Exception as e:
-            print(f"     ⚠️  API error for {uuid_str[:8]}...: {e}")
+            logger.debug("     ⚠️  API error for %s...: %s", uuid_str[:8], e)
         
         # Method 3: Try the other workspace (cross-workspace lookup)
-        other_workspace_id = self.target_workspace['workspace_id'] if workspace_id == self.source_workspace['workspace_id'] else self.source_workspace['workspace_id']
-        other_workspace_name = self.target_workspace['workspace_name'] if workspace_id == self.source_workspace['workspace_id'] else self.source_workspace['workspace_name']
+        other_workspace_id, other_workspace_name = self._other_workspace[workspace_id]
         
         try:
-            response = requests.get(
-                f"{self.base_url}/api/v1/workspaces/{other_workspace_id}/nodes/{uuid_str}",
-                headers=self.headers,
-                timeout=30
-            )
+            response = self._get_node(other_workspace_id, uuid_str)
             methods_tried.append(f"cross_workspace_{other_workspace_id}")
             
             if response.status_code == 200:
-                node_data = response.json()
+                node_data = response_json(response)
                 node_info = node_data.get('data', node_data)
                 real_name = node_info.get('name', f'Node_{uuid_str}')
                 node_type = node_info.get('type', 'Unknown')
                 
                 # Add to lookup table
                 self._add_to_uuid_lookup(uuid_str, real_name, node_type, other_workspace_id, other_workspace_name, 'cross_workspace')
-                print(f"     ✅ Found in other workspace: {uuid_str[:8]}... → '{real_name}' (Type: {node_type})")
+                logger.debug("     ✅ Found in other workspace: %s... → '%s' (Type: %s)", uuid_str[:8], real_name, node_type)
                 return real_name, node_type
                 
         except Exception as e:
-            print(f"     ⚠️  Cross-workspace lookup error: {e}")
+            logger.debug("     ⚠️  Cross-workspace lookup error: %s", e)
             methods_tried.append(f"cross_workspace_error")
         
         # Method 4: Check if it's a malformed UUID that might be a node name
         if not ('-' in uuid_str and len(uuid_str) > 30):
             # This might already be a name, not a UUID
             self._add_to_uuid_lookup(uuid_str, uuid_str, 'Assumed_Name', workspace_id, workspace_name, 'assumed_name')
-            print(f"     📝 Treating as name: {uuid_str}")
+            logger.debug("     📝 Treating as name: %s", uuid_str)
             return uuid_str, 'Assumed_Name'
         
         # All methods failed - record the failure
         self._add_failed_lookup(uuid_str, workspace_id, 'All resolution methods failed', ','.join(methods_tried))
         fallback_name = f"UUID_{uuid_str[:8]}"
-        print(f"     ❌ Failed to resolve: {uuid_str[:8]}... → using '{fallback_name}'")
+        logger.debug("     ❌ Failed to resolve: %s... → using '%s'", uuid_str[:8], fallback_name)
         return fallback_name, 'Unknown'
 
-    def bulk_resolve_uuids(self, uuid_list, workspace_id, workspace_name):
+    def bulk_resolve_uuids(self, uuid_list, workspace_id, workspace_name, max_workers=MAX_CONCURRENT_REQUESTS):
         """Bulk resolve a list of UUIDs for efficiency"""
-        print(f"\n🔍 BULK UUID RESOLUTION: {len(uuid_list)} UUIDs in {workspace_name}")
+        # Subgraphs often reference shared nodes more than once; resolve each once, in order
+        unique = list(dict.fromkeys(str(u) for u in uuid_list))
+        duplicates = len(uuid_list) - len(unique)
+        print(f"\n🔍 BULK UUID RESOLUTION: {len(unique)} UUIDs in {workspace_name}"
+              + (f" ({duplicates} duplicate references skipped)" if duplicates else ""))
         print("-" * 60)
         
-        resolved_count = 0
-        for i, uuid in enumerate(uuid_list, 1):
-            print(f"   {i:3d}/{len(uuid_list)}: Resolving {str(uuid)[:8]}...")
-            name, node_type = self._resolve_uuid_to_name(uuid, workspace_id, workspace_name)
-            if not name.startswith('UUID_'):
-                resolved_count += 1
+        # Resolve each uncached UUID concurrently over the pooled session
+        misses = [u for u in unique if self._lookup_uuid_in_dataframe(u) is None]
+        resolved = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(
+                lambda u: self._resolve_uuid_to_name(u, workspace_id, workspace_name), misses)
+            for n, (uuid_str, result) in enumerate(zip(misses, results), 1):
+                resolved[uuid_str] = result
+                if n % RESOLVE_PROGRESS_EVERY == 0:
+                    logger.info("   ... %d/%d uncached UUIDs looked up", n, len(misses))
+        
+        # Index total failures under their placeholder name so neither repeats
+        # nor later subgraphs retry them (they stay out of the lookup tables)
+        for uuid_str, (name, node_type) in resolved.items():
+            if uuid_str not in self._uuid_index:
+                self._uuid_index[uuid_str] = {
+                    'uuid': uuid_str,
+                    'name': name,
+                    'type': node_type,
+                    'workspace_id': str(workspace_id),
+                    'workspace_name': str(workspace_name),
+                    'source': 'unresolved'
+                }
+        
+        # Every UUID is indexed now (failures under their placeholder name)
+        resolved_count = sum(1 for uuid in unique if not self._uuid_index[uuid]['name'].startswith('UUID_'))
         
-        print(f"   ✅ Successfully resolved: {resolved_count}/{len(uuid_list)} UUIDs")
+        self._save_uuid_cache()
+        print(f"   ✅ Successfully resolved: {resolved_count}/{len(unique)} UUIDs "
+              f"({len(misses)} new, {len(unique) - len(misses)} already resolved)")
         return resolved_count
 
     def get_all_nodes_from_subgraph(self, workspace_id, subgraph_id, subgraph_name, workspace_name):
@@ -180,16 +421,15 @@ class EnhancedNodeComparison:
         print(f"\n>> Getting all nodes from '{subgraph_name}' (ID: {subgraph_id}) in {workspace_name}")
         
         try:
-            response = requests.get(
-                f"{self.base_url}/api/v1/workspaces/{workspace_id}/subgraphs/{subgraph_id}",
-                headers=self.headers
+            response = self.session.get(
+                f"{self.base_url}/api/v1/workspaces/{workspace_id}/subgraphs/{subgraph_id}"
             )
             
             if response.status_code != 200:
                 print(f"   ❌ Could not get subgraph: {response.status_code}")
                 return None
             
-            subgraph_data = response.json()
+            subgraph_data = response_json(response)
             sg_details = subgraph_data.get('data', subgraph_data)
             steps = sg_details.get('steps', [])
             
@@ -209,25 +449,17 @@ class EnhancedNodeComparison:
             # Bulk resolve all UUIDs to names
             self.bulk_resolve_uuids(uuid_list, workspace_id, workspace_name)
             
-            # Build node details with resolved names
+            # Build node details with resolved names in one pass; the names are
+            # exactly its keys. Bulk resolution indexed every UUID, failures included
             node_details = {}
-            node_names = set()
-            
             for uuid in uuid_list:
-                # Get resolved name from our lookup
-                lookup_result = self._lookup_uuid_in_dataframe(str(uuid))
-                if lookup_result:
-                    real_name = lookup_result['name']
-                    node_type = lookup_result['type']
-                else:
-                    real_name, node_type = self._resolve_uuid_to_name(uuid, workspace_id, workspace_name)
-                
-                node_names.add(real_name)
-                node_details[real_name] = {
+                lookup_result = self._uuid_index[str(uuid)]
+                node_details[lookup_result['name']] = {
                     'id': uuid,
-                    'type': node_type,
+                    'type': lookup_result['type'],
                     'resolved_from_uuid': True
                 }
+            node_names = frozenset(node_details)
             
             print(f"   ✅ Total: {len(node_names)} resolved node names ready for comparison")
             
@@ -291,7 +523,7 @@ class EnhancedNodeComparison:
                 'error': f'Could not get target subgraph {target_id}',
                 'source_nodes': source_data['node_count'],
                 'target_nodes': 0,
-                'missing_nodes': list(source_data['node_names']),
+                'missing_nodes': source_data['node_names'],
                 'extra_nodes': []
             }
         
@@ -299,15 +531,22 @@ class EnhancedNodeComparison:
         source_names = source_data['node_names']
         target_names = target_data['node_names']
         
-        missing_names = source_names - target_names
-        extra_names = target_names - source_names
+        if len(source_names) > VECTORIZED_DIFF_THRESHOLD:
+            # Very large subgraphs: hash and diff the names in pandas instead of the interpreter
+            source_index = pd.Index(list(source_names))
+            target_index = pd.Index(list(target_names))
+            missing_names = source_index.difference(target_index).tolist()
+            extra_names = target_index.difference(source_index).tolist()
+        else:
+            missing_names = source_names - target_names
+            extra_names = target_names - source_names
         
         print(f"   Source: {len(source_names)} resolved nodes")
         print(f"   Target: {len(target_names)} resolved nodes")
         
         if missing_names:
             print(f"   ❌ Missing {len(missing_names)} nodes:")
-            for node_name in sorted(list(missing_names))[:5]:
+            for node_name in heapq.nsmallest(5, missing_names):
                 node_info = source_data['node_details'].get(node_name, {})
                 print(f"     - '{node_name}' (Type: {node_info.get('type', 'Unknown')})")
             if len(missing_names) > 5:
@@ -317,7 +556,7 @@ class EnhancedNodeComparison:
         
         if extra_names:
             print(f"   ℹ️  Extra {len(extra_names)} nodes in target:")
-            for node_name in sorted(list(extra_names))[:3]:
+            for node_name in heapq.nsmallest(3, extra_names):
                 node_info = target_data['node_details'].get(node_name, {})
                 print(f"     + '{node_name}' (Type: {node_info.get('type', 'Unknown')})")
             if len(extra_names) > 3:
@@ -333,8 +572,10 @@ class EnhancedNodeComparison:
             'target_subgraph_name': target_data['actual_name'],
             'source_nodes': len(source_names),
             'target_nodes': len(target_names),
-            'missing_nodes': list(missing_names),
-            'extra_nodes': list(extra_names),
+            # Kept as computed (frozensets, or lists from the pandas path); the
+            # report sorts the missing names itself and the rest only needs len()
+            'missing_nodes': missing_names,
+            'extra_nodes': extra_names,
             'status': status,
             'source_node_details': source_data['node_details'],
             'target_node_details': target_data['node_details'],
@@ -344,37 +585,57 @@ class EnhancedNodeComparison:
         return result
 
     def save_uuid_lookup_tables(self):
-        """Save UUID lookup tables as CSV and JSON files"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        """
+        Save UUID lookup tables as Parquet (when pyarrow is installed) and/or
+        CSV and JSON files; set EMIT_CSV to get CSV/JSON alongside Parquet
+        """
+        timestamp = self._run_timestamp
+        
+        # Build each dataframe once from the buffered rows
+        uuid_lookup_df = pd.DataFrame(self._uuid_lookup_rows, columns=UUID_LOOKUP_COLUMNS)
+        for col in CATEGORICAL_LOOKUP_COLUMNS:
+            uuid_lookup_df[col] = uuid_lookup_df[col].astype('category')
+        failed_lookups_df = pd.DataFrame(self._failed_rows, columns=FAILED_LOOKUP_COLUMNS)
         
         # Save successful lookups
-        if not self.uuid_lookup_df.empty:
-            csv_filename = f"uuid_lookup_table_{timestamp}.csv"
-            json_filename = f"uuid_lookup_table_{timestamp}.json"
-            
-            # Save as CSV for easy Excel viewing
-            self.uuid_lookup_df.to_csv(csv_filename, index=False)
+        lookup_file = None
+        if not uuid_lookup_df.empty:
+            print(f"   📊 UUID Lookup Table saved:")
             
-            # Save as JSON for programmatic use
-            self.uuid_lookup_df.to_json(json_filename, orient='records', indent=2)
+            # Columnar and compressed: much smaller and faster to write than JSON
+            if pyarrow is not None:
+                parquet_filename = f"uuid_lookup_table_{timestamp}.parquet"
+                uuid_lookup_df.to_parquet(parquet_filename, compression='snappy', index=False)
+                print(f"      Parquet: {parquet_filename} ({len(uuid_lookup_df)} entries)")
+                lookup_file = parquet_filename
             
-            print(f"   📊 UUID Lookup Table saved:")
-            print(f"      CSV: {csv_filename} ({len(self.uuid_lookup_df)} entries)")
-            print(f"      JSON: {json_filename}")
+            if pyarrow is None or os.getenv('EMIT_CSV'):
+                csv_filename = f"uuid_lookup_table_{timestamp}.csv"
+                json_filename = f"uuid_lookup_table_{timestamp}.json"
+                
+                # Save as CSV for easy Excel viewing
+                uuid_lookup_df.to_csv(csv_filename, index=False)
+                
+                # Save as JSON for programmatic use
+                uuid_lookup_df.to_json(json_filename, orient='records', indent=2)
+                
+                print(f"      CSV: {csv_filename} ({len(uuid_lookup_df)} entries)")
+                print(f"      JSON: {json_filename}")
+                lookup_file = lookup_file or csv_filename
             
             # Show statistics
             print(f"   📈 Resolution Statistics:")
-            source_counts = self.uuid_lookup_df['source'].value_counts()
+            source_counts = uuid_lookup_df['source'].value_counts()
             for source, count in source_counts.items():
                 print(f"      {source}: {count} UUIDs")
         
         # Save failed lookups
-        if not self.failed_lookups_df.empty:
+        if not failed_lookups_df.empty:
             failed_filename = f"failed_uuid_lookups_{timestamp}.csv"
-            self.failed_lookups_df.to_csv(failed_filename, index=False)
-            print(f"   ⚠️  Failed lookups saved: {failed_filename} ({len(self.failed_lookups_df)} entries)")
+            failed_lookups_df.to_csv(failed_filename, index=False)
+            print(f"   ⚠️  Failed lookups saved: {failed_filename} ({len(failed_lookups_df)} entries)")
         
-        return csv_filename if not self.uuid_lookup_df.empty else None
+        return lookup_file
 
     def save_enhanced_missing_nodes_summary(self, comparison_results):
         """Save enhanced missing nodes summary with resolved names"""
@@ -405,102 +666,105 @@ class EnhancedNodeComparison:
         # Sort alphabetically by resolved name
         overall_missing.sort(key=lambda x: x['node_name'].upper())
         
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        timestamp = self._run_timestamp
         filename = get_file_pattern('missing_nodes_resolved', timestamp=timestamp)
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(f"MISSING NODES REPORT - {self.project_info['name'].upper()} (ENHANCED WITH UUID RESOLUTION)\n")
-            f.write("=" * 80 + "\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Method: Dynamic node name comparison with UUID resolution\n")
-            f.write(f"Config: migration_config.py\n")
-            f.write(f"Source: {self.source_workspace.get('workspace_name')} (ID: {self.source_workspace.get('workspace_id')})\n")
-            f.write(f"Target: {self.target_workspace.get('workspace_name')} (ID: {self.target_workspace.get('workspace_id')})\n")
-            f.write(f"Enhancement: UUIDs resolved to actual node names using pandas lookup tables\n\n")
-            
-            f.write(f"TOTAL MISSING NODES: {len(overall_missing)}\n")
-            f.write("-" * 80 + "\n\n")
-            
-            # Group by subgraph
-            by_subgraph = {}
-            for missing in overall_missing:
-                sg_name = missing['subgraph']
-                if sg_name not in by_subgraph:
-                    by_subgraph[sg_name] = []
-                by_subgraph[sg_name].append(missing)
-            
-            # Sort each subgraph's missing nodes alphabetically
-            for sg_name in by_subgraph:
-                by_subgraph[sg_name].sort(key=lambda x: x['node_name'].upper())
-            
-            # Show resolved vs unresolved statistics
-            resolved_count = len([m for m in overall_missing if m['resolved_from_uuid']])
-            unresolved_count = len(overall_missing) - resolved_count
+        # Assemble the report in memory and write it out in one call
+        parts = []
+        parts.append(f"MISSING NODES REPORT - {self.project_info['name'].upper()} (ENHANCED WITH UUID RESOLUTION)\n")
+        parts.append("=" * 80 + "\n")
+        parts.append(f"Generated: {self._run_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        parts.append(f"Method: Dynamic node name comparison with UUID resolution\n")
+        parts.append(f"Config: migration_config.py\n")
+        parts.append(f"Source: {self.source_workspace.get('workspace_name')} (ID: {self.source_workspace.get('workspace_id')})\n")
+        parts.append(f"Target: {self.target_workspace.get('workspace_name')} (ID: {self.target_workspace.get('workspace_id')})\n")
+        parts.append(f"Enhancement: UUIDs resolved to actual node names using pandas lookup tables\n\n")
+        
+        parts.append(f"TOTAL MISSING NODES: {len(overall_missing)}\n")
+        parts.append("-" * 80 + "\n\n")
+        
+        # Group by subgraph
+        by_subgraph = {}
+        for missing in overall_missing:
+            sg_name = missing['subgraph']
+            if sg_name not in by_subgraph:
+                by_subgraph[sg_name] = []
+            by_subgraph[sg_name].append(missing)
+        
+        # Sort each subgraph's missing nodes alphabetically
+        for sg_name in by_subgraph:
+            by_subgraph[sg_name].sort(key=lambda x: x['node_name'].upper())
+        
+        # Show resolved vs unresolved statistics
+        resolved_count = len([m for m in overall_missing if m['resolved_from_uuid']])
+        unresolved_count = len(overall_missing) - resolved_count
+        
+        parts.append(f"UUID RESOLUTION STATISTICS:\n")
+        parts.append(f"  ✅ Successfully resolved from UUID: {resolved_count} nodes\n")
+        parts.append(f"  ⚠️  Could not resolve: {unresolved_count} nodes\n\n")
+        
+        # Process subgraphs in alphabetical order
+        for sg_name in sorted(by_subgraph.keys()):
+            missing_nodes = by_subgraph[sg_name]
+            parts.append(f"SUBGRAPH: {sg_name}\n")
+            parts.append(f"Missing: {len(missing_nodes)} nodes\n")
+            parts.append(f"Source ID: {missing_nodes[0]['source_id']}\n")
+            parts.append(f"Target ID: {missing_nodes[0]['target_id']}\n")
+            parts.append("-" * 40 + "\n")
             
-            f.write(f"UUID RESOLUTION STATISTICS:\n")
-            f.write(f"  ✅ Successfully resolved from UUID: {resolved_count} nodes\n")
-            f.write(f"  ⚠️  Could not resolve: {unresolved_count} nodes\n\n")
-            
-            # Process subgraphs in alphabetical order
-            for sg_name in sorted(by_subgraph.keys()):
-                missing_nodes = by_subgraph[sg_name]
-                f.write(f"SUBGRAPH: {sg_name}\n")
-                f.write(f"Missing: {len(missing_nodes)} nodes\n")
-                f.write(f"Source ID: {missing_nodes[0]['source_id']}\n")
-                f.write(f"Target ID: {missing_nodes[0]['target_id']}\n")
-                f.write("-" * 40 + "\n")
-                
-                for i, missing in enumerate(missing_nodes, 1):
-                    f.write(f"{i:3d}. {missing['node_name']}\n")
-                    f.write(f"     Type: {missing['node_type']}\n")
-                    if missing['resolved_from_uuid']:
-                        f.write(f"     Original UUID: {missing['original_uuid']}\n")
-                        f.write(f"     Status: ✅ Resolved from UUID\n")
-                    else:
-                        f.write(f"     Status: ⚠️  Name resolution failed\n")
-                    f.write(f"\n")
-                
-                f.write("\n")
+            for i, missing in enumerate(missing_nodes, 1):
+                parts.append(f"{i:3d}. {missing['node_name']}\n")
+                parts.append(f"     Type: {missing['node_type']}\n")
+                if missing['resolved_from_uuid']:
+                    parts.append(f"     Original UUID: {missing['original_uuid']}\n")
+                    parts.append(f"     Status: ✅ Resolved from UUID\n")
+                else:
+                    parts.append(f"     Status: ⚠️  Name resolution failed\n")
+                parts.append(f"\n")
             
-            # Enhanced alphabetical list with UUID info
-            f.write("=" * 80 + "\n")
-            f.write("ALL MISSING NODES (ALPHABETICAL) - ENHANCED WITH UUID RESOLUTION\n")
-            f.write("=" * 80 + "\n\n")
+            parts.append("\n")
+        
+        # Enhanced alphabetical list with UUID info
+        parts.append("=" * 80 + "\n")
+        parts.append("ALL MISSING NODES (ALPHABETICAL) - ENHANCED WITH UUID RESOLUTION\n")
+        parts.append("=" * 80 + "\n\n")
+        
+        # overall_missing is sorted case-insensitively, so each first letter is one run
+        numbered = enumerate(overall_missing, 1)
+        by_letter = groupby(numbered, key=lambda item: item[1]['node_name'][0].upper())
+        for g, (first_letter, group) in enumerate(by_letter):
+            if g:
+                parts.append("\n")
+            parts.append(f"=== {first_letter} ===\n")
             
-            current_letter = ""
-            for i, missing in enumerate(overall_missing, 1):
-                node_name = missing['node_name']
-                first_letter = node_name[0].upper()
-                
-                if first_letter != current_letter:
-                    if current_letter:
-                        f.write("\n")
-                    f.write(f"=== {first_letter} ===\n")
-                    current_letter = first_letter
-                
+            for i, missing in group:
                 status = "✅ Resolved" if missing['resolved_from_uuid'] else "⚠️  Unresolved"
-                f.write(f"{i:3d}. {node_name} ({status})\n")
-                f.write(f"     Subgraph: {missing['subgraph']}\n")
-                f.write(f"     Type: {missing['node_type']}\n")
+                parts.append(f"{i:3d}. {missing['node_name']} ({status})\n")
+                parts.append(f"     Subgraph: {missing['subgraph']}\n")
+                parts.append(f"     Type: {missing['node_type']}\n")
                 if missing['resolved_from_uuid']:
-                    f.write(f"     Original UUID: {missing['original_uuid'][:8]}...\n")
-            
-            f.write("\n\n")
-            f.write("INTERPRETATION:\n")
-            f.write("These are MISSING NODES with enhanced UUID resolution:\n")
-            f.write("- ✅ Resolved nodes: UUIDs were successfully converted to actual node names\n")
-            f.write("- ⚠️  Unresolved nodes: Could not determine actual names (may need manual lookup)\n\n")
-            
-            f.write("RECOMMENDATIONS:\n")
-            f.write("1. Focus on recreating the ✅ resolved nodes (names are confirmed)\n")
-            f.write("2. For ⚠️  unresolved nodes, check UUID lookup table for details\n")
-            f.write("3. Use the CSV lookup table to cross-reference UUIDs with node names\n")
-            f.write("4. Consider manual recreation of critical missing nodes in Coalesce UI\n")
-            f.write("5. Check if nodes exist elsewhere in target workspace\n")
+                    parts.append(f"     Original UUID: {missing['original_uuid'][:8]}...\n")
+        
+        parts.append("\n\n")
+        parts.append("INTERPRETATION:\n")
+        parts.append("These are MISSING NODES with enhanced UUID resolution:\n")
+        parts.append("- ✅ Resolved nodes: UUIDs were successfully converted to actual node names\n")
+        parts.append("- ⚠️  Unresolved nodes: Could not determine actual names (may need manual lookup)\n\n")
+        
+        parts.append("RECOMMENDATIONS:\n")
+        parts.append("1. Focus on recreating the ✅ resolved nodes (names are confirmed)\n")
+        parts.append("2. For ⚠️  unresolved nodes, check UUID lookup table for details\n")
+        parts.append("3. Use the UUID lookup table (uuid_lookup_table_*.parquet; .csv/.json with EMIT_CSV=1\n"
+                     "   or without pyarrow) to cross-reference UUIDs with node names\n")
+        parts.append("4. Consider manual recreation of critical missing nodes in Coalesce UI\n")
+        parts.append("5. Check if nodes exist elsewhere in target workspace\n")
+        
+        with open(filename, 'w', encoding='utf-8', buffering=1024 * 1024) as f:
+            f.write(''.join(parts))
         
         return filename
 
-    def run_enhanced_comparison(self):
+    def run_enhanced_comparison(self, bulk_fetch=False):
         """Run complete enhanced node comparison with UUID resolution"""
         print(f"\n>>> {self.project_info['name'].upper()} ENHANCED NODE COMPARISON WITH UUID RESOLUTION")
         print("=" * 80)
@@ -512,6 +776,14 @@ class EnhancedNodeComparison:
         print(f"[INFO] Comparing {len(self.verification_pairs)} subgraph pairs with UUID resolution")
         print(f"[ENHANCED] UUIDs will be resolved to actual node names using pandas")
         
+        self._run_time = datetime.now()
+        self._run_timestamp = self._run_time.strftime('%Y%m%d_%H%M%S')
+        
+        if bulk_fetch:
+            print(f"\n[BULK] Listing workspace nodes up front...")
+            for workspace in (self.source_workspace, self.target_workspace):
+                self._bulk_fetch_workspace_nodes(workspace['workspace_id'], workspace['workspace_name'])
+        
         # Compare each pair with UUID resolution
         comparison_results = []
         
@@ -538,7 +810,7 @@ class EnhancedNodeComparison:
         print(f"✅ Complete: {complete_subgraphs} subgraphs (all nodes found)")
         print(f"❌ Missing: {total_missing} nodes total")
         print(f"ℹ️  Extra: {total_extra} nodes in target")
-        print(f"🔍 UUID Resolution: {len(self.uuid_lookup_df)} UUIDs resolved to names")
+        print(f"🔍 UUID Resolution: {len(self._uuid_lookup_rows)} UUIDs resolved to names")
         
         if total_missing > 0:
             print(f"\n📝 MISSING NODES BY SUBGRAPH (WITH RESOLVED NAMES):")
@@ -556,23 +828,48 @@ class EnhancedNodeComparison:
         if lookup_file:
             print(f"   🔍 UUID Lookup Table: {lookup_file}")
         
-        if not self.failed_lookups_df.empty:
-            print(f"   ⚠️  Failed UUID Lookups: {len(self.failed_lookups_df)} UUIDs could not be resolved")
+        if self._failed_rows:
+            print(f"   ⚠️  Failed UUID Lookups: {len(self._failed_rows)} UUIDs could not be resolved")
         
         print(f"\n🚀 ENHANCEMENTS APPLIED:")
         print(f"   ✅ UUID-to-name resolution using pandas dataframes")
         print(f"   ✅ Cross-workspace UUID lookup capability")
-        print(f"   ✅ Comprehensive lookup tables saved as CSV/JSON")
+        print(f"   ✅ Comprehensive lookup tables saved as "
+              f"{'CSV/JSON' if pyarrow is None else 'Parquet (CSV/JSON too with EMIT_CSV=1)'}")
         print(f"   ✅ Enhanced missing nodes report with actual names")
         print(f"   ✅ Resolution statistics and success rates")
         
         return total_missing == 0
 
+def _configure_logging(verbose=False):
+    """Log resolution progress to stdout as plain lines, including per-UUID detail when verbose"""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.handlers[:] = [handler]
+    logger.setLevel(logging.DEBUG if verbose else logging.INFO)
+    logger.propagate = False
+
 def main():
     """Run enhanced node comparison with UUID resolution"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description='Enhanced Migration Verification with UUID Resolution')
+    parser.add_argument('--refresh', action='store_true',
+                        help=f'Re-resolve every UUID through the API instead of reusing {UUID_CACHE_PATH}')
+    parser.add_argument('--bulk-fetch', action='store_true',
+                        help='List each workspace\'s nodes up front instead of one request per UUID')
+    parser.add_argument('--seed-lookup', metavar='PATH',
+                        help='Reuse a saved uuid_lookup_table (.parquet, .csv or .json) before calling the API')
+    parser.add_argument('--verbose', action='store_true', help='Show per-UUID resolution detail')
+    
+    args = parser.parse_args()
+    _configure_logging(args.verbose)
     try:
-        comparison = EnhancedNodeComparison()
-        success = comparison.run_enhanced_comparison()
+        comparison = EnhancedNodeComparison(use_cache=not args.refresh)
+        if args.seed_lookup:
+            comparison.seed_uuid_lookup(args.seed_lookup)
+        success = comparison.run_enhanced_comparison(bulk_fetch=args.bulk_fetch)
         
         if success:
             print(f"\n✅ ALL NODES MIGRATED SUCCESSFULLY!")
@@ -582,7 +879,7 @@ def main():
             print(f"\n🔍 ENHANCED ANALYSIS:")
             print(f"   - Missing nodes now show actual names instead of UUIDs")
             print(f"   - UUID lookup table available for cross-reference")
-            print(f"   - Resolution success rate: {len(comparison.uuid_lookup_df)} UUIDs resolved")
+            print(f"   - Resolution success rate: {len(comparison._uuid_lookup_rows)} UUIDs resolved")
             return 1
             
     except Exception as e:
@@ -4,13 +4,87 @@ Quick Node Structure Inspector
 
 """
 
-import requests
 import json
 import os
+import re
+import sys
+import logging
 from dotenv import load_dotenv
-from coalesce_conn import load_config_from_env
+from coalesce_conn import load_config_from_env, create_session, fetch_nodes_bulk, response_json
+from coalesce_cache import load_cached_node, store_cached_node
+
+# Optional: faster JSON encoding for large node samples
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from migration_config import get_migration_config
 
+# Per-field detail is logged at DEBUG (LOG_LEVEL=DEBUG) so it costs nothing otherwise
+logger = logging.getLogger('node_structure_inspector')
+
+INSPECT_NODE_COUNT = 3  # Nodes of the subgraph inspected in detail
+MAX_CONCURRENT_REQUESTS = 16  # Parallel node-detail requests
+
+# dbt-style ref('node') (group 1) or source('source', 'table') (groups 2, 3)
+# calls in node SQL, matched in a single scan
+_REF_OR_SOURCE_RE = re.compile(
+    r"ref\(['\"]([^'\"]+)['\"]\)"
+    r"|source\(['\"]([^'\"]+)['\"]\s*,\s*['\"]([^'\"]+)['\"]\)",
+    re.IGNORECASE)
+
+# Field names that may hold a node's predecessors, matched by set intersection
+_PREDECESSOR_FIELDS = frozenset([
+    'predecessorNodeIDs', 'predecessor_node_ids', 'predecessorNodeIds',
+    'predecessors', 'predecessor_nodes', 'parentNodeIDs', 'parent_node_ids',
+    'dependencies', 'deps', 'sources', 'inputs', 'lineage', 'upstream'
+])
+_SQL_FIELDS = ('sql', 'query', 'code', 'definition', 'statement')  # In priority order
+
+def _dump_json_file(data, file):
+    """Write data to a JSON file with 2-space indentation"""
+    if orjson is not None:
+        with open(file, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(file, 'w') as f:
+            json.dump(data, f, indent=2)
+
+def _step_id(step):
+    """Node ID of a subgraph step (a bare ID string or a step dict)"""
+    if isinstance(step, str):
+        return step
+    if isinstance(step, dict):
+        return step.get('id', step.get('nodeId', str(step)))
+    return str(step)
+
+def _fetch_node_infos(session, base_url, workspace_id, node_ids):
+    """Return {node_id: node_info} from the node cache, fetching (and caching) the rest in one batch"""
+    # Source nodes are read-only here, so cached details from earlier runs are reused
+    node_infos = {}
+    for node_id in node_ids:
+        cached = load_cached_node(workspace_id, node_id)
+        if cached is not None:
+            node_infos[node_id] = cached
+    
+    uncached = [node_id for node_id in node_ids if node_id not in node_infos]
+    if uncached:
+        fetched = fetch_nodes_bulk(session, base_url, workspace_id, uncached,
+                                   max_workers=MAX_CONCURRENT_REQUESTS)
+        for node_id, node_info in fetched.items():
+            store_cached_node(workspace_id, node_id, node_info)
+        node_infos.update(fetched)
+    
+    return node_infos
+
+def _configure_logging():
+    """Log to stdout as plain lines at LOG_LEVEL (default INFO)"""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.handlers[:] = [handler]
+    logger.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+    logger.propagate = False
+
 def inspect_node_structure():
     """Inspect actual node structures to debug dependency detection"""
     
@@ -22,13 +96,6 @@ def inspect_node_structure():
         return
     
     base_url = config_data.get('base_url', '').rstrip('/')
-    access_token = config_data.get('access_token')
-    
-    headers = {
-        'Authorization': f'Bearer {access_token}',
-        'Accept': 'application/json',
-        'Content-Type': 'application/json'
-    }
     
     migration_config = get_migration_config()
     source_workspace = migration_config.get("source", {}).get("workspace_id")
@@ -54,79 +121,78 @@ def inspect_node_structure():
     
     print(f"Inspecting subgraph: {subgraph_name} (ID: {subgraph_id})")
     
+    # Pooled keep-alive session, shared by the concurrent node-detail requests
+    session = create_session(config_data, pool_maxsize=MAX_CONCURRENT_REQUESTS)
+    
     try:
         # Get subgraph details
-        response = requests.get(
+        response = session.get(
             f"{base_url}/api/v1/workspaces/{source_workspace}/subgraphs/{subgraph_id}",
-            headers=headers
+            timeout=30
         )
         
         if response.status_code != 200:
             print(f"❌ Could not get subgraph: {response.status_code}")
             return
         
-        subgraph_data = response.json()
+        subgraph_data = response_json(response)
         sg_details = subgraph_data.get('data', subgraph_data)
         steps = sg_details.get('steps', [])
         
         print(f"✅ Subgraph has {len(steps)} nodes")
         
-        # Inspect first 3 nodes in detail
-        for i, step in enumerate(steps[:3]):
-            if isinstance(step, str):
-                node_id = step
-            elif isinstance(step, dict):
-                node_id = step.get('id', step.get('nodeId', str(step)))
-            else:
-                node_id = str(step)
-            
+        # Inspect first nodes in detail, fetching their details in one batch
+        node_ids = [_step_id(step) for step in steps[:INSPECT_NODE_COUNT]]
+        
+        node_infos = _fetch_node_infos(session, base_url, source_workspace, node_ids)
+        
+        for i, node_id in enumerate(node_ids):
             print(f"\n🔍 INSPECTING NODE {i+1}: {node_id}")
             print("-" * 40)
             
-            # Get node details
-            node_response = requests.get(
-                f"{base_url}/api/v1/workspaces/{source_workspace}/nodes/{node_id}",
-                headers=headers
-            )
-            
-            if node_response.status_code == 200:
-                node_data = node_response.json()
-                node_info = node_data.get('data', node_data)
-                
-                print("📋 ALL TOP-LEVEL FIELDS:")
-                if isinstance(node_info, dict):
-                    for key in sorted(node_info.keys()):
-                        value = node_info[key]
+            node_info = node_infos.get(node_id)
+            if node_info is not None:
+                if isinstance(node_info, dict) and logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("📋 ALL TOP-LEVEL FIELDS:")
+                    # One pass buckets fields by type; only the scalar group is sorted
+                    scalars, lists, dicts, other = [], [], [], []
+                    for key, value in node_info.items():
                         if isinstance(value, (str, int, float, bool)):
-                            if len(str(value)) > 50:
-                                print(f"   {key}: <{type(value).__name__}> ({len(str(value))} chars)")
-                            else:
-                                print(f"   {key}: {value}")
+                            scalars.append(key)
                         elif isinstance(value, list):
-                            print(f"   {key}: <list> ({len(value)} items)")
-                            if len(value) > 0:
-                                print(f"      Sample: {value[0] if len(str(value[0])) < 50 else f'<{type(value[0]).__name__}>'}")
+                            lists.append(key)
                         elif isinstance(value, dict):
-                            print(f"   {key}: <dict> ({len(value)} keys)")
-                            print(f"      Keys: {list(value.keys())}")
+                            dicts.append(key)
                         else:
-                            print(f"   {key}: <{type(value).__name__}>")
+                            other.append(key)
+                    
+                    for key in sorted(scalars):
+                        value = node_info[key]
+                        value_len = len(value) if isinstance(value, str) else len(str(value))
+                        if value_len > 50:
+                            logger.debug("   %s: <%s> (%d chars)", key, type(value).__name__, value_len)
+                        else:
+                            logger.debug("   %s: %s", key, value)
+                    for key in lists:
+                        value = node_info[key]
+                        logger.debug("   %s: <list> (%d items)", key, len(value))
+                        if len(value) > 0:
+                            sample = value[0] if len(str(value[0])) < 50 else f'<{type(value[0]).__name__}>'
+                            logger.debug("      Sample: %s", sample)
+                    for key in dicts:
+                        value = node_info[key]
+                        logger.debug("   %s: <dict> (%d keys)", key, len(value))
+                        logger.debug("      Keys: %s", list(value.keys()))
+                    for key in other:
+                        logger.debug("   %s: <%s>", key, type(node_info[key]).__name__)
                 
                 # Look specifically for predecessor-related fields
                 print("\n🎯 PREDECESSOR/DEPENDENCY FIELDS:")
-                predecessor_candidates = [
-                    'predecessorNodeIDs', 'predecessor_node_ids', 'predecessorNodeIds',
-                    'predecessors', 'predecessor_nodes', 'parentNodeIDs', 'parent_node_ids',
-                    'dependencies', 'deps', 'sources', 'inputs', 'lineage', 'upstream'
-                ]
-                
-                found_any = False
-                for field in predecessor_candidates:
-                    if field in node_info:
-                        print(f"   ✅ {field}: {node_info[field]}")
-                        found_any = True
+                predecessor_hits = sorted(_PREDECESSOR_FIELDS.intersection(node_info))
+                for field in predecessor_hits:
+                    print(f"   ✅ {field}: {node_info[field]}")
                 
-                if not found_any:
+                if not predecessor_hits:
                     print("   ❌ No obvious predecessor/dependency fields found")
                 
                 # Check config for dependencies
@@ -135,21 +201,27 @@ def inspect_node_structure():
                     config = node_info['config']
                     print(f"   Config keys: {list(config.keys())}")
                     
-                    for field in predecessor_candidates:
-                        if field in config:
-                            print(f"   ✅ Config.{field}: {config[field]}")
+                    for field in sorted(_PREDECESSOR_FIELDS.intersection(config)):
+                        print(f"   ✅ Config.{field}: {config[field]}")
                 
                 # Check for SQL content
-                sql_fields = ['sql', 'query', 'code', 'definition', 'statement']
-                for field in sql_fields:
-                    if field in node_info and node_info[field]:
-                        sql_content = str(node_info[field])
-                        print(f"\n💾 {field.upper()} CONTENT ({len(sql_content)} chars):")
+                for field in _SQL_FIELDS:
+                    if node_info.get(field):
+                        # SQL text is scanned as-is; only non-string bodies are stringified
+                        sql_content = node_info[field]
+                        if not isinstance(sql_content, str):
+                            sql_content = str(sql_content)
+                        sql_len = len(sql_content)
+                        print(f"\n💾 {field.upper()} CONTENT ({sql_len} chars):")
                         
-                        # Look for ref() patterns
-                        import re
-                        ref_patterns = re.findall(r"ref\(['\"]([^'\"]+)['\"]\)", sql_content, re.IGNORECASE)
-                        source_patterns = re.findall(r"source\(['\"]([^'\"]+)['\"]\s*,\s*['\"]([^'\"]+)['\"]\)", sql_content, re.IGNORECASE)
+                        # Look for ref() and source() patterns
+                        ref_patterns = []
+                        source_patterns = []
+                        for ref_name, source_name, table_name in _REF_OR_SOURCE_RE.findall(sql_content):
+                            if ref_name:
+                                ref_patterns.append(ref_name)
+                            else:
+                                source_patterns.append((source_name, table_name))
                         
                         if ref_patterns:
                             print(f"   📌 ref() patterns: {ref_patterns}")
@@ -157,30 +229,26 @@ def inspect_node_structure():
                             print(f"   📌 source() patterns: {source_patterns}")
                         
                         # Show first 200 chars of SQL
-                        print(f"   First 200 chars: {sql_content[:200]}{'...' if len(sql_content) > 200 else ''}")
+                        print(f"   First 200 chars: {sql_content[:200]}{'...' if sql_len > 200 else ''}")
                         break
                 
             else:
-                print(f"❌ Could not get node details: {node_response.status_code}")
+                print(f"❌ Could not get node details")
         
-        # Save full raw data for the first node
-        if steps:
-            first_node_id = steps[0] if isinstance(steps[0], str) else steps[0].get('id', str(steps[0]))
-            node_response = requests.get(
-                f"{base_url}/api/v1/workspaces/{source_workspace}/nodes/{first_node_id}",
-                headers=headers
-            )
+        # Save the first node's full details (the response's data object), reusing them from above
+        if node_ids:
+            first_node_id = node_ids[0]
             
-            if node_response.status_code == 200:
+            if first_node_id in node_infos:
                 filename = f"node_structure_sample_{first_node_id}.json"
-                with open(filename, 'w') as f:
-                    json.dump(node_response.json(), f, indent=2)
+                _dump_json_file(node_infos[first_node_id], filename)
                 print(f"\n💾 Full node structure saved to: {filename}")
     
     except Exception as e:
-        print(f"❌ Error during inspection: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Error during inspection: %s", e)
+    finally:
+        session.close()
 
 if __name__ == "__main__":
+    _configure_logging()
     inspect_node_structure()
\ No newline at end of file
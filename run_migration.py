@@ -1,39 +1,78 @@
 #!/usr/bin/env python3
 """
-Complete Migration Runner - No Subprocess Capture
-Runs migration scripts directly without capturing output to avoid hanging
+Complete Migration Runner - In-Process Phases
+Runs each migration script's main() in this process, streaming its output
+directly, so phases share imports, loaded config and on-disk caches
 """
 
-import subprocess
+import importlib
+import fnmatch
+import json
 import sys
 import os
-import glob
+import logging
+from collections import namedtuple
+from datetime import datetime
+from coalesce_conn import load_config_from_env, validate_config
 from migration_config import get_migration_config, get_project_info
 
-def run_script_simple(script_name, phase_name):
-    """Run script without capturing output - let it stream directly"""
+logger = logging.getLogger('run_migration')
+
+# Kept out of the working directory so no phase's *.json input scan picks them up
+MANIFEST_DIR = '.manifests'
+
+def run_phase(script_name, phase_name):
+    """Run a phase script's main() in this process - its output streams directly"""
     print(f"\n>>> PHASE {phase_name.upper()}: {script_name}")
     print("=" * 60)
     
+    # Scripts record sys.argv[0] as their name in result metadata
+    saved_argv = sys.argv
+    sys.argv = [script_name]
     try:
-        # Run without capture_output - let it stream directly to console
-        result = subprocess.run([sys.executable, script_name])
+        module = importlib.import_module(os.path.splitext(script_name)[0])
+        module.main()
+        
+        print(f"\n[OK] {phase_name.upper()} PHASE COMPLETED SUCCESSFULLY")
+        return True
         
-        if result.returncode == 0:
+    except SystemExit as e:
+        if e.code in (None, 0):
             print(f"\n[OK] {phase_name.upper()} PHASE COMPLETED SUCCESSFULLY")
             return True
-        else:
-            print(f"\n[ERROR] {phase_name.upper()} PHASE FAILED")
-            print(f"Return code: {result.returncode}")
-            return False
-            
+        print(f"\n[ERROR] {phase_name.upper()} PHASE FAILED")
+        print(f"Return code: {e.code}")
+        return False
+        
     except Exception as e:
         print(f"\n[ERROR] Error running {script_name}: {e}")
         return False
+        
+    finally:
+        sys.argv = saved_argv
+
+def _scan_cwd():
+    """Return {file name: mtime} for the current directory from a single scan (like glob, skipping dotfiles)"""
+    with os.scandir('.') as entries:
+        return {entry.name: entry.stat().st_mtime for entry in entries if not entry.name.startswith('.')}
 
-def check_files_exist(pattern, phase_name):
-    """Check if required files exist for next phase"""
-    files = glob.glob(pattern)
+def _write_manifest(phase_name, outputs, success):
+    """Record the files a phase produced, and whether they passed its check, in MANIFEST_DIR/{phase}_manifest.json"""
+    manifest = {
+        'phase': phase_name,
+        'outputs': outputs,
+        'timestamp': datetime.now().isoformat(),
+        'success': success
+    }
+    os.makedirs(MANIFEST_DIR, exist_ok=True)
+    manifest_file = os.path.join(MANIFEST_DIR, f"{phase_name.lower().replace(' ', '_')}_manifest.json")
+    with open(manifest_file, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+def check_files_exist(pattern, phase_name, outputs=None):
+    """Check if required files exist for next phase (among a phase's outputs, if given)"""
+    cwd_files = _scan_cwd() if outputs is None else outputs
+    files = fnmatch.filter(cwd_files, pattern)
     if files:
         print(f"[OK] Found {len(files)} files for {phase_name} phase: {pattern}")
         # Show what files were actually found
@@ -46,7 +85,7 @@ def check_files_exist(pattern, phase_name):
         print(f"[ERROR] No files found for {phase_name} phase: {pattern}")
         
         # Show what files ARE available to help debug
-        all_json = glob.glob("*.json")
+        all_json = fnmatch.filter(cwd_files, "*.json")
         if all_json:
             print(f"[DEBUG] Available JSON files:")
             for file in all_json:
@@ -54,37 +93,14 @@ def check_files_exist(pattern, phase_name):
         
         return False
 
-def main():
-    """Run complete migration workflow including subgraph recreation"""
-    config = get_migration_config()
-    project = get_project_info()
-    
-    print(f">>> {project['name'].upper()} COMPLETE MIGRATION RUNNER")
-    print("=" * 60)
-    print(f"Project: {project['name']} ({project['identifier']})")
-    print(f"Dry Run: {config.get('dry_run', True)}")
-    print(f"Source: Workspace {config.get('source', {}).get('workspace_id', 'Unknown')}")
-    print(f"Target: Workspace {config.get('target', {}).get('workspace_id', 'Unknown')}")
-    
-    # Phase 1: Export
-    print(f"\n>>> STARTING COMPLETE MIGRATION WORKFLOW")
-    print(f"   Phase 1: Export subgraphs from source")
-    print(f"   Phase 2: Create nodes in target")
-    print(f"   Phase 3: Update metadata")
-    print(f"   Phase 4: Recreate subgraphs with all nodes")
-    
-    success1 = run_script_simple('universal_subgraph_migration.py', 'EXPORT')
-    
-    if not success1:
-        print(f"\n[STOP] Phase 1 failed - stopping workflow")
-        return False
-    
+def _check_export_files(outputs):
+    """Check Phase 1 exported subgraph files (not migration results) for the CREATE phase"""
     # FIXED: Check for exported files with correct pattern
     # Use generic pattern that matches actual file naming: subgraph_*.json (but not subgraph_migration_*)
     export_pattern = "subgraph_*.json"
     
     # Filter out migration results manually
-    all_subgraph_files = glob.glob(export_pattern)
+    all_subgraph_files = fnmatch.filter(outputs, export_pattern)
     export_files = [f for f in all_subgraph_files if not f.startswith('subgraph_migration_')]
     
     if not export_files:
@@ -106,37 +122,95 @@ def main():
     print(f"[OK] Found {len(export_files)} export files for CREATE phase")
     for file in export_files:
         print(f"      ✓ {file}")
+    return True
+
+# A phase runs once every phase in deps succeeded; a failed required phase stops
+# the workflow, and check (if set) verifies the files this run of the phase
+# wrote (as listed in its manifest) before moving on, so stale files from
+# earlier runs can't satisfy it
+Phase = namedtuple('Phase', 'name script deps required check')
+
+PHASES = [
+    Phase('EXPORT', 'universal_subgraph_migration.py', (), True, _check_export_files),
+    Phase('CREATE', 'universal_node_creator.py', ('EXPORT',), True,
+          lambda outputs: check_files_exist("*created_nodes*.json", "UPDATE", outputs)),
+    Phase('UPDATE', 'universal_metadata_updater.py', ('CREATE',), True, None),
+    # Subgraph recreation and duplicate cleanup only need the updated metadata
+    Phase('RECREATE SUBGRAPHS', 'update_subgraph.py', ('UPDATE',), False, None),
+    Phase('DUPLICATE CLEANUP', 'post_metadata_cleanup.py', ('UPDATE',), False, None),
+]
+
+def run_phases(phases):
+    """Run phases in order, skipping any whose deps failed; returns {phase name: success}"""
+    results = {}
+    for phase in phases:
+        failed_deps = [dep for dep in phase.deps if not results.get(dep)]
+        if failed_deps:
+            print(f"\n[SKIP] {phase.name} phase - depends on failed phase(s): {', '.join(failed_deps)}")
+            results[phase.name] = False
+            continue
+        
+        before = _scan_cwd()
+        success = run_phase(phase.script, phase.name)
+        if success:
+            outputs = sorted(name for name, mtime in _scan_cwd().items() if before.get(name) != mtime)
+            if phase.check is not None:
+                success = phase.check(outputs)
+            _write_manifest(phase.name, outputs, success)
+        results[phase.name] = success
+        
+        if not success and phase.required:
+            print(f"\n[STOP] {phase.name} phase failed - stopping workflow")
+            break
     
-    # Phase 2: Create
-    success2 = run_script_simple('universal_node_creator.py', 'CREATE')
-    
-    if not success2:
-        print(f"\n[STOP] Phase 2 failed - stopping workflow")
-        return False
-    
-    # Check for creation files before Phase 3 - use generic pattern
-    if not check_files_exist("*created_nodes*.json", "UPDATE"):
-        print(f"\n[STOP] No creation result files found - stopping workflow")
+    return results
+
+def _configure_logging():
+    """Log to stdout as plain lines at LOG_LEVEL (default INFO)"""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.handlers[:] = [handler]
+    logger.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+    logger.propagate = False
+
+def main():
+    """Run complete migration workflow including subgraph recreation"""
+    # Preflight: check API credentials once, before any phase runs; the phases
+    # run in this process and reuse the same cached config
+    if not validate_config(load_config_from_env()):
+        print(f"[STOP] Coalesce API configuration is missing or invalid - check your .env")
         return False
     
-    # Phase 3: Update
-    success3 = run_script_simple('universal_metadata_updater.py', 'UPDATE')
+    config = get_migration_config()
+    project = get_project_info()
     
-    if not success3:
-        print(f"\n[STOP] Phase 3 failed - stopping workflow")
-        return False
+    print(f">>> {project['name'].upper()} COMPLETE MIGRATION RUNNER")
+    print("=" * 60)
+    print(f"Project: {project['name']} ({project['identifier']})")
+    print(f"Dry Run: {config.get('dry_run', True)}")
+    print(f"Source: Workspace {config.get('source', {}).get('workspace_id', 'Unknown')}")
+    print(f"Target: Workspace {config.get('target', {}).get('workspace_id', 'Unknown')}")
     
-    # Phase 4: Recreate Subgraphs (NEW!)
-    print(f"\n>>> PHASE 4: Recreating subgraphs with all nodes (including manually created)")
-    print(f"This will ensure your DV Stage and Source nodes are properly organized")
+    print(f"\n>>> STARTING COMPLETE MIGRATION WORKFLOW")
+    print(f"   Phase 1: Export subgraphs from source")
+    print(f"   Phase 2: Create nodes in target")
+    print(f"   Phase 3: Update metadata")
+    print(f"   Phase 4: Recreate subgraphs with all nodes")
+    print(f"   Phase 5: Clean up duplicates")
     
-    success4 = run_script_simple('update_subgraph.py', 'RECREATE SUBGRAPHS')
+    results = run_phases(PHASES)
+    if not all(results.get(phase.name) for phase in PHASES if phase.required):
+        return False
     
+    success4 = results['RECREATE SUBGRAPHS']
     if not success4:
         print(f"\n[WARNING] Phase 4 failed - subgraphs may need manual organization")
         print(f"[INFO] The nodes were still created successfully in phases 1-3")
         print(f"[INFO] You can manually organize nodes into subgraphs in Coalesce UI")
     
+    if not results['DUPLICATE CLEANUP']:
+        print(f"[WARNING] Phase 5 (duplicate cleanup) had issues - check for duplicates manually")
+    
     # Success summary
     print(f"\n>>> COMPLETE MIGRATION WORKFLOW FINISHED!")
     print("=" * 60)
@@ -148,12 +222,6 @@ def main():
         print(f"[OK] First 3 phases completed successfully")
         print(f"[WARNING] Phase 4 (subgraph recreation) had issues")
     
-    # Phase 5: Duplicate Cleanup
-    success5 = run_script_simple('post_metadata_cleanup.py', 'DUPLICATE CLEANUP')
-    if not success5:
-        print(f"[WARNING] Phase 5 (duplicate cleanup) had issues - check for duplicates manually")
-        
-    
     # Check for manual action files - use generic patterns
     manual_patterns = [
         "*MANUAL_DOWNLOAD_REQUIRED*.txt",
@@ -163,9 +231,12 @@ def main():
         "*manual_updates*.txt"
     ]
     
+    # One directory scan (with mtimes) serves every pattern below
+    cwd_files = _scan_cwd()
+    
     manual_files = []
     for pattern in manual_patterns:
-        manual_files.extend(glob.glob(pattern))
+        manual_files.extend(fnmatch.filter(cwd_files, pattern))
     
     if manual_files:
         print(f"\n[WARNING] Manual action files created:")
@@ -184,7 +255,7 @@ def main():
     ]
     
     for pattern in result_patterns:
-        files = glob.glob(pattern)
+        files = fnmatch.filter(cwd_files, pattern)
         if files:
             # For subgraph files, separate export vs migration results
             if pattern == "subgraph_*.json":
@@ -192,13 +263,13 @@ def main():
                 migration_files = [f for f in files if f.startswith('subgraph_migration_')]
                 
                 if export_files:
-                    latest_export = max(export_files, key=os.path.getmtime)
+                    latest_export = max(export_files, key=cwd_files.get)
                     print(f"  >> {latest_export} (EXPORT)")
                 if migration_files:
-                    latest_migration = max(migration_files, key=os.path.getmtime) 
+                    latest_migration = max(migration_files, key=cwd_files.get) 
                     print(f"  >> {latest_migration} (MIGRATION RESULT)")
             else:
-                latest = max(files, key=os.path.getmtime)
+                latest = max(files, key=cwd_files.get)
                 print(f"  >> {latest}")
     
     workspace_id = config.get('target', {}).get('workspace_id', 'Unknown')
@@ -225,14 +296,13 @@ def main():
         print(f"   3. Manually organize nodes into subgraphs in Coalesce UI")
         print(f"   4. Test node executions")
     
-    return success1 and success2 and success3  # Phase 4 is nice-to-have
+    return True  # Phases 4 and 5 are nice-to-have
 
 if __name__ == "__main__":
+    _configure_logging()
     try:
         main()
     except KeyboardInterrupt:
         print(f"\n[CANCELLED] Migration cancelled by user")
     except Exception as e:
-        print(f"\n[ERROR] Migration failed: {e}")
-        import traceback
-        traceback.print_exc()
\ No newline at end of file
+        logger.exception("\n[ERROR] Migration failed: %s", e)
\ No newline at end of file
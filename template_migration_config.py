@@ -6,6 +6,9 @@ Copy this file to migration_config.py and customize for your specific project
 """
 
 import os
+import string
+from collections import namedtuple
+from functools import lru_cache
 from pathlib import Path
 
 # Load environment variables from .env file
@@ -18,8 +21,9 @@ except ImportError:
 # =============================================================================
 # API CONFIGURATION - Loaded from .env file
 # =============================================================================
+@lru_cache(maxsize=1)
 def get_api_config():
-    """Get API configuration from environment variables"""
+    """Get API configuration from environment variables (read once per process)"""
     base_url = os.getenv('COALESCE_BASE_URL')
     access_token = os.getenv('COALESCE_ACCESS_TOKEN')
     
@@ -127,6 +131,14 @@ MIGRATION_CONFIG = {
 # HELPER FUNCTIONS FOR MIGRATION & VERIFICATION
 # =============================================================================
 
+# Template values that mean a field still needs customizing
+_PLACEHOLDER_VALUES = frozenset({
+    'YOUR_PROJECT_NAME', 'your_project_identifier', 'SOURCE_WORKSPACE_ID', 'TARGET_WORKSPACE_ID'
+})
+_PLACEHOLDER_SUBGRAPH_NAME_PREFIX = 'Subgraph Name'  # "Subgraph Name 1", ...
+_PLACEHOLDER_SOURCE_ID_PREFIX = 'SOURCE_SUBGRAPH_ID'  # "SOURCE_SUBGRAPH_ID_1", ...
+_PENDING_TARGET_ID = 'TBD'  # target_id before the subgraph has been migrated
+
 def get_migration_config():
     """Get the migration configuration"""
     return MIGRATION_CONFIG
@@ -140,6 +152,22 @@ def get_project_info():
         "description": "Migration project"
     })
 
+_CONVERSIONS = {None: lambda value: value, 's': str, 'r': repr, 'a': ascii}  # str.format's !s/!r/!a
+
+@lru_cache(maxsize=64)
+def _parse_file_pattern(pattern):
+    """
+    Split a format pattern into (literal, field, format_spec, conversion) chunks once
+    
+    Returns None when the pattern uses positional, attribute or index fields
+    or nested format specs, which are left to str.format.
+    """
+    chunks = tuple(string.Formatter().parse(pattern))
+    for _, field, format_spec, _ in chunks:
+        if field is not None and (not field.isidentifier() or '{' in format_spec):
+            return None
+    return chunks
+
 def get_file_pattern(pattern_type, **kwargs):
     """Get a file naming pattern with substitutions"""
     config = get_migration_config()
@@ -152,41 +180,68 @@ def get_file_pattern(pattern_type, **kwargs):
     kwargs.setdefault('identifier', project['identifier'])
     kwargs.setdefault('project_name', project['name'])
     
-    return pattern.format(**kwargs)
-
-def get_subgraphs_for_migration():
-    """Get subgraphs configured for migration (source_id format for universal_subgraph_migration.py)"""
-    config = get_migration_config()
-    subgraphs = []
-    
-    for sg in config.get("subgraphs", []):
-        if isinstance(sg, dict) and sg.get("source_id"):
-            # Convert to universal migration format
-            subgraphs.append({
-                "name": sg["name"],
-                "id": sg["source_id"]  # Use source_id as "id" for migration script
-            })
+    chunks = _parse_file_pattern(pattern)
+    if chunks is None:
+        return pattern.format(**kwargs)
     
-    return subgraphs
+    parts = []
+    for literal, field, format_spec, conversion in chunks:
+        parts.append(literal)
+        if field is not None:
+            parts.append(format(_CONVERSIONS[conversion](kwargs[field]), format_spec))
+    return ''.join(parts)
 
-def get_subgraphs_for_verification():
-    """Get subgraphs configured for verification (both source_id and target_id)"""
-    config = get_migration_config()
+_SubgraphIndex = namedtuple(
+    '_SubgraphIndex', 'migration_list verification_pairs errors migration_ready verification_ready')
+
+def _classify_subgraphs(subgraphs):
+    """Walk the configured subgraphs once, collecting what the helpers below report"""
+    migration_list = []
     verification_pairs = []
+    errors = []
+    migration_ready = 0
+    verification_ready = 0
     
-    for sg in config.get("subgraphs", []):
-        if isinstance(sg, dict) and sg.get("source_id"):
-            target_id = sg.get("target_id")
-            
-            # Only include if target_id is set and not "TBD"
-            if target_id and target_id != "TBD":
+    for i, sg in enumerate(subgraphs):
+        if not isinstance(sg, dict):
+            errors.append(f"Subgraph {i+1} must be a dict with source_id and target_id")
+            continue
+        
+        name = sg.get('name')
+        source_id = sg.get('source_id')
+        target_id = sg.get('target_id')
+        
+        if not name or name.startswith(_PLACEHOLDER_SUBGRAPH_NAME_PREFIX):
+            errors.append(f"Subgraph {i+1} name must be customized (replace 'Subgraph Name X')")
+        
+        if source_id:
+            # Convert to universal migration format (source_id as "id" for migration script)
+            migration_list.append({"name": name, "id": source_id})
+        
+        if not source_id or source_id.startswith(_PLACEHOLDER_SOURCE_ID_PREFIX):
+            errors.append(f"Subgraph {i+1} source_id must be customized (replace SOURCE_SUBGRAPH_ID_X)")
+        else:
+            migration_ready += 1
+        
+        # Only verifiable if target_id is set and not "TBD"
+        if target_id and target_id != _PENDING_TARGET_ID:
+            verification_ready += 1
+            if source_id:
                 verification_pairs.append({
-                    "name": sg["name"],
-                    "source_id": sg["source_id"],
+                    "name": name,
+                    "source_id": source_id,
                     "target_id": target_id
                 })
     
-    return verification_pairs
+    return _SubgraphIndex(migration_list, verification_pairs, errors, migration_ready, verification_ready)
+
+def get_subgraphs_for_migration():
+    """Get subgraphs configured for migration (source_id format for universal_subgraph_migration.py)"""
+    return _classify_subgraphs(get_migration_config().get("subgraphs", [])).migration_list
+
+def get_subgraphs_for_verification():
+    """Get subgraphs configured for verification (both source_id and target_id)"""
+    return _classify_subgraphs(get_migration_config().get("subgraphs", [])).verification_pairs
 
 def get_target_id_update_instructions(migration_results):
     """Generate instructions for updating target_id fields after migration"""
@@ -221,19 +276,19 @@ def validate_migration_config():
     
     # Check project info
     project = config.get("project", {})
-    if not project.get("name") or project.get("name") == "YOUR_PROJECT_NAME":
+    if not project.get("name") or project.get("name") in _PLACEHOLDER_VALUES:
         errors.append("Project name must be customized (replace YOUR_PROJECT_NAME)")
-    if not project.get("identifier") or project.get("identifier") == "your_project_identifier":
+    if not project.get("identifier") or project.get("identifier") in _PLACEHOLDER_VALUES:
         errors.append("Project identifier must be customized (replace your_project_identifier)")
     
     # Check source workspace
     source_id = config.get("source", {}).get("workspace_id")
-    if not source_id or source_id == "SOURCE_WORKSPACE_ID":
+    if not source_id or source_id in _PLACEHOLDER_VALUES:
         errors.append("Source workspace_id must be customized (replace SOURCE_WORKSPACE_ID)")
     
     # Check target workspace  
     target_id = config.get("target", {}).get("workspace_id")
-    if not target_id or target_id == "TARGET_WORKSPACE_ID":
+    if not target_id or target_id in _PLACEHOLDER_VALUES:
         errors.append("Target workspace_id must be customized (replace TARGET_WORKSPACE_ID)")
     
     # Check subgraphs
@@ -242,28 +297,10 @@ def validate_migration_config():
         errors.append("At least one subgraph must be specified")
     
     # Validate subgraph format
-    migration_ready = 0
-    verification_ready = 0
-    
-    for i, sg in enumerate(subgraphs):
-        if not isinstance(sg, dict):
-            errors.append(f"Subgraph {i+1} must be a dict with source_id and target_id")
-            continue
-            
-        if not sg.get('name') or sg.get('name').startswith('Subgraph Name'):
-            errors.append(f"Subgraph {i+1} name must be customized (replace 'Subgraph Name X')")
-            
-        source_id = sg.get('source_id')
-        if not source_id or source_id.startswith('SOURCE_SUBGRAPH_ID'):
-            errors.append(f"Subgraph {i+1} source_id must be customized (replace SOURCE_SUBGRAPH_ID_X)")
-        else:
-            migration_ready += 1
-            
-        target_id = sg.get('target_id')
-        if target_id and target_id != "TBD":
-            verification_ready += 1
+    index = _classify_subgraphs(subgraphs)
+    errors.extend(index.errors)
     
-    return errors, migration_ready, verification_ready
+    return errors, index.migration_ready, index.verification_ready
 
 def print_migration_plan():
     """Print the migration and verification plan"""
@@ -298,20 +335,17 @@ def print_migration_plan():
     # Subgraph status
     print(f"\n>>> SUBGRAPH CONFIGURATION:")
     subgraphs = config.get("subgraphs", [])
-    migration_ready = 0
-    verification_ready = 0
+    index = _classify_subgraphs(subgraphs)
+    migration_ready = index.migration_ready
+    verification_ready = index.verification_ready
     
     for sg in subgraphs:
         if isinstance(sg, dict):
             name = sg.get('name', 'Unknown')
             source_id = sg.get('source_id', 'No source_id')
-            target_id = sg.get('target_id', 'TBD')
+            target_id = sg.get('target_id', _PENDING_TARGET_ID)
             
-            if source_id != 'No source_id' and not source_id.startswith('SOURCE_SUBGRAPH_ID'):
-                migration_ready += 1
-                
-            if target_id != 'TBD':
-                verification_ready += 1
+            if target_id != _PENDING_TARGET_ID:
                 print(f"   ✅ {name} (Source: {source_id} → Target: {target_id}) [MIGRATION & VERIFICATION READY]")
             else:
                 print(f"   📄 {name} (Source: {source_id} → Target: {target_id}) [MIGRATION READY, VERIFICATION PENDING]")
@@ -12,7 +12,8 @@ import os
 import sys
 from datetime import datetime
 from dotenv import load_dotenv
-from coalesce_conn import load_config_from_env
+from coalesce_conn import load_config_from_env, create_session
+from coalesce_cache import get_node_cached
 from migration_config import get_migration_config, get_project_info
 
 class EnhancedSubgraphMigration:
@@ -34,6 +35,9 @@ class EnhancedSubgraphMigration:
             'Content-Type': 'application/json'
         }
         
+        # Keep-alive session for node detail requests
+        self.session = create_session(config_data)
+        
         # Load migration configuration
         self.migration_config = get_migration_config()
         self.project_info = get_project_info()
@@ -316,26 +320,22 @@ class EnhancedSubgraphMigration:
             return self.node_cache[cache_key]
         
         try:
-            response = requests.get(
-                f"{self.base_url}/api/v1/workspaces/{workspace_id}/nodes/{node_id}",
-                headers=self.headers
-            )
+            # Source nodes aren't modified by the migration, so the on-disk
+            # cache shared with other scripts and runs can serve them
+            status_code, node_info = get_node_cached(self.session, self.base_url, workspace_id, node_id)
             
-            if response.status_code == 200:
-                node_data = response.json()
-                node_info = node_data.get('data', node_data)
-                
+            if status_code == 200:
                 # Cache the result
                 self.node_cache[cache_key] = node_info
                 return node_info
             else:
-                print(f"     [WARNING] Could not get node {node_id}: {response.status_code}")
+                print(f"     [WARNING] Could not get node {node_id}: {status_code}")
                 # Track failed node download
                 if not hasattr(self, 'failed_node_downloads'):
                     self.failed_node_downloads = []
                 self.failed_node_downloads.append({
                     'node_id': node_id,
-                    'error': f"HTTP {response.status_code}",
+                    'error': f"HTTP {status_code}",
                     'action_required': 'Manual export from Coalesce UI'
                 })
                 return None